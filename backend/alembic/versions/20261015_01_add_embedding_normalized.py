@@ -0,0 +1,30 @@
+"""Track whether stored message embeddings are unit-normalized."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261015_01"
+down_revision = "bf9aa4e0dbb4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == "postgresql"
+    # Existing rows were stored raw; retrieval keeps normalizing them until re-embedded.
+    op.add_column(
+        "messages",
+        sa.Column(
+            "embedding_normalized",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.text("false" if is_postgres else "0"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("messages", "embedding_normalized")
@@ -77,16 +77,27 @@ class Settings(BaseSettings):
         default="sentence-transformers/all-MiniLM-L6-v2", alias="EMBEDDING_MODEL_NAME"
     )
     max_results: int = Field(default=8, alias="MAX_RESULTS")
+    vector_index_enabled: bool = Field(default=False, alias="VECTOR_INDEX_ENABLED")
+    vector_index_hnsw_m: int = Field(default=0, alias="VECTOR_INDEX_HNSW_M")
+    vector_index_refresh_lookback_seconds: float = Field(
+        default=300.0, alias="VECTOR_INDEX_REFRESH_LOOKBACK_SECONDS"
+    )
     importance_weights: ImportanceWeights = Field(
         default_factory=ImportanceWeights, alias="IMPORTANCE_WEIGHTS"
     )
     async_embeddings: bool = Field(default=False)
+    embedding_batch_size: int = Field(default=32, alias="EMBEDDING_BATCH_SIZE")
+    embedding_batch_max_wait_ms: float = Field(default=0.0, alias="EMBEDDING_BATCH_MAX_WAIT_MS")
     embedding_job_poll_seconds: float = Field(default=1.0, alias="EMBEDDING_JOB_POLL_SECONDS")
     embedding_job_batch_size: int = Field(default=10, alias="EMBEDDING_JOB_BATCH_SIZE")
+    embedding_job_concurrency: int = Field(default=4, alias="EMBEDDING_JOB_CONCURRENCY")
     embedding_job_max_attempts: int = Field(default=3, alias="EMBEDDING_JOB_MAX_ATTEMPTS")
     embedding_job_retry_backoff_seconds: float = Field(
         default=5.0, alias="EMBEDDING_JOB_RETRY_BACKOFF_SECONDS"
     )
+    pipeline_queue_depth: int = Field(default=64, alias="PIPELINE_QUEUE_DEPTH")
+    pipeline_upsert_batch_size: int = Field(default=64, alias="PIPELINE_UPSERT_BATCH_SIZE")
+    pipeline_flush_interval_ms: float = Field(default=25.0, alias="PIPELINE_FLUSH_INTERVAL_MS")
 
     retention_max_age_days: int = Field(default=30, alias="RETENTION_MAX_AGE_DAYS")
     retention_importance_threshold: float = Field(
@@ -95,6 +106,7 @@ class Settings(BaseSettings):
     retention_delete_after_days: int = Field(default=90, alias="RETENTION_DELETE_AFTER_DAYS")
     retention_schedule_seconds: int = Field(default=86400, alias="RETENTION_SCHEDULE_SECONDS")
     retention_tenants: list[str] = Field(default_factory=lambda: ["*"], alias="RETENTION_TENANTS")
+    retention_max_parallel: int = Field(default=4, alias="RETENTION_MAX_PARALLEL")
 
     healthcheck_timeout_seconds: float = Field(
         default=2.0, alias="HEALTHCHECK_TIMEOUT_SECONDS"
@@ -110,12 +122,22 @@ class Settings(BaseSettings):
     cache_max_items: int = Field(default=2000, alias="CACHE_MAX_ITEMS")
     cache_search_ttl_seconds: int = Field(default=60, alias="CACHE_SEARCH_TTL_SECONDS")
     cache_embedding_ttl_seconds: int = Field(default=3600, alias="CACHE_EMBEDDING_TTL_SECONDS")
+    cache_query_embedding_ttl_seconds: int = Field(
+        default=86400, alias="CACHE_QUERY_EMBEDDING_TTL_SECONDS"
+    )
+    query_embedding_lru_size: int = Field(default=1024, alias="QUERY_EMBEDDING_LRU_SIZE")
+    cache_invalidate_coalesce_ms: float = Field(default=50.0, alias="CACHE_INVALIDATE_COALESCE_MS")
     circuit_failure_threshold: int = Field(default=5, alias="CIRCUIT_FAILURE_THRESHOLD")
     circuit_recovery_seconds: int = Field(default=30, alias="CIRCUIT_RECOVERY_SECONDS")
+    circuit_call_timeout_seconds: float = Field(default=5.0, alias="CIRCUIT_CALL_TIMEOUT_SECONDS")
     redis_url: str | None = Field(default=None, alias="REDIS_URL")
     require_redis_in_production: bool = Field(default=True, alias="REQUIRE_REDIS_IN_PRODUCTION")
     health_embed_check_enabled: bool = Field(default=False, alias="HEALTH_EMBED_CHECK_ENABLED")
     readiness_embed_timeout_seconds: float = Field(default=3.0, alias="READINESS_EMBED_TIMEOUT_SECONDS")
+    health_redis_timeout_seconds: float = Field(default=1.0, alias="HEALTH_REDIS_TIMEOUT_SECONDS")
+    health_metrics_timeout_seconds: float = Field(
+        default=0.5, alias="HEALTH_METRICS_TIMEOUT_SECONDS"
+    )
 
     # JWT Authentication
     jwt_secret_key: str = Field(default="change-me-in-production", alias="JWT_SECRET_KEY")
@@ -215,6 +237,11 @@ class Settings(BaseSettings):
             return [item.strip() for item in value.split(",") if item.strip()]
         return value
 
+    @property
+    def api_key_set(self) -> frozenset[str]:
+        """``api_keys`` as a set, derived on access so in-place edits are never stale."""
+        return frozenset(self._split_api_keys(self.api_keys))
+
     def sync_database_url(self) -> str:
         """Return sync-compatible database URL for Alembic/migrations."""
         url: URL = make_url(self.database_url)
@@ -29,6 +29,7 @@ from ai_memory_layer.rate_limit import RateLimitMiddleware
 from ai_memory_layer.routes import api_router
 from ai_memory_layer.scheduler import RetentionScheduler
 from ai_memory_layer.services.job_queue import EmbeddingJobQueue
+from ai_memory_layer.services.monitoring import close_monitoring_service
 # Tracing is optional
 
 configure_logging()
@@ -133,10 +134,10 @@ async def lifespan(app: FastAPI):
         global SCHEDULER  # noqa: PLW0602
         SCHEDULER = RetentionScheduler()
         await SCHEDULER.start()
-        if get_settings().async_embeddings:
-            global JOB_QUEUE  # noqa: PLW0602
-            JOB_QUEUE = EmbeddingJobQueue()
-            await JOB_QUEUE.start()
+        # Inline mode still queues a job for every message whose embedding failed.
+        global JOB_QUEUE  # noqa: PLW0602
+        JOB_QUEUE = EmbeddingJobQueue()
+        await JOB_QUEUE.start()
         logger.info("application_started", version=__version__)
     except Exception as exc:
         logger.exception("application_startup_failed", error=str(exc))
@@ -151,6 +152,7 @@ async def lifespan(app: FastAPI):
             await SCHEDULER.stop()
         if JOB_QUEUE:
             await JOB_QUEUE.stop()
+        await close_monitoring_service()
         if engine:
             await engine.dispose()
         if read_engines:
@@ -132,3 +132,22 @@ def record_embedding_job(status: str, duration: float | None = None) -> None:
     EMBEDDING_JOB_COUNT.labels(status=status).inc()
     if duration is not None:
         EMBEDDING_JOB_DURATION.labels(status=status).observe(duration)
+
+
+def get_metrics() -> dict[str, float]:
+    """Summarize HTTP request counters for health and monitoring reports."""
+    if not PROMETHEUS_AVAILABLE:  # pragma: no cover - optional dependency
+        return {}
+    total = 0.0
+    errors = 0.0
+    for metric in REQUEST_COUNT.collect():
+        for sample in metric.samples:
+            if not sample.name.endswith("_total"):
+                continue
+            total += sample.value
+            if sample.labels.get("status", "").startswith("5"):
+                errors += sample.value
+    return {
+        "http_requests_total": total,
+        "error_rate": errors / total if total else 0.0,
+    }
@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID, uuid4
 
+import numpy as np
 from sqlalchemy import JSON, Boolean, DateTime, Enum, ForeignKey, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column
@@ -22,16 +23,23 @@ if not USE_PGVECTOR_STUB:
 else:
 
     class VectorType(TypeDecorator):
-        """JSON-backed stub for environments where pgvector isn't available."""
+        """JSON-backed stub for environments where pgvector isn't available.
+
+        Like pgvector's type, loaded values are float32 ndarrays rather than lists.
+        """
 
         impl = JSON
         cache_ok = True
 
         def process_bind_param(self, value, dialect):
+            if isinstance(value, np.ndarray):
+                return value.tolist()
             return value
 
         def process_result_value(self, value, dialect):
-            return value
+            if value is None:
+                return None
+            return np.asarray(value, dtype=np.float32)
 
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
@@ -48,6 +56,8 @@ class Message(Base):
     message_metadata: Mapped[dict[str, Any]] = mapped_column("metadata", JSON, default=dict)
     importance_score: Mapped[float | None] = mapped_column()
     embedding: Mapped[list[float] | None] = mapped_column(VectorType(), nullable=True)
+    # True when `embedding` was stored at unit length, so retrieval can skip re-normalizing it.
+    embedding_normalized: Mapped[bool] = mapped_column(Boolean, default=False)
     embedding_status: Mapped[str] = mapped_column(
         Enum("pending", "completed", "failed", name="embedding_status"), default="pending"
     )
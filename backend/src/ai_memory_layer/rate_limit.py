@@ -2,10 +2,9 @@
 
 from __future__ import annotations
 
-import asyncio
+import math
 import re
 import time
-from collections import defaultdict, deque
 from dataclasses import dataclass
 from typing import Callable, NamedTuple
 
@@ -42,26 +41,33 @@ class BaseRateLimiter:
 
 
 class InMemoryRateLimiter(BaseRateLimiter):
-    """Simple fixed-window limiter safe for asyncio usage."""
+    """Token bucket per key: ``amount`` burst capacity, refilled evenly over the window.
+
+    State is just ``(tokens, last_refill)`` per key, so each hit is O(1) regardless of
+    the limit. No lock is needed because ``hit`` never awaits between read and write.
+    """
 
     def __init__(self) -> None:
-        self._lock = asyncio.Lock()
-        self._windows: dict[str, deque[float]] = defaultdict(deque)
+        self._buckets: dict[str, tuple[float, float]] = {}
 
     async def hit(self, config: RateLimitConfig, identifier: str) -> RateLimitResult:
         key = self._key(config, identifier)
-        now = time.time()
-        window_start = now - config.window_seconds
-        async with self._lock:
-            entries = self._windows[key]
-            while entries and entries[0] <= window_start:
-                entries.popleft()
-            entries.append(now)
-            count = len(entries)
-            allowed = count <= config.amount
-            reset = int((entries[0] + config.window_seconds) * 1000) if entries else int(
-                (now + config.window_seconds) * 1000
-            )
+        capacity = float(config.amount)
+        rate = capacity / config.window_seconds
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - last) * rate)
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+            # Seconds until the bucket is full again.
+            wait = (capacity - tokens) / rate
+        else:
+            # Seconds until the next token, which is what Retry-After should report.
+            wait = (1.0 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        count = config.amount - math.floor(tokens) + (0 if allowed else 1)
+        reset = int((time.time() + wait) * 1000)
         return RateLimitResult(allowed=allowed, count=count, reset_epoch_ms=reset)
 
     def _key(self, config: RateLimitConfig, identifier: str) -> str:
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import Select, func, select, update
+from sqlalchemy import DateTime, Select, delete, func, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ai_memory_layer.models.memory import ArchivedMessage, EmbeddingJob, Message, RetentionPolicy
@@ -16,55 +16,56 @@ from ai_memory_layer.models.memory import ArchivedMessage, EmbeddingJob, Message
 class MemoryRepository:
     """Repository encapsulating DB access for memories."""
 
-    async def create_message(
-        self,
-        session: AsyncSession,
-        *,
-        tenant_id: str,
-        conversation_id: str,
-        role: str,
-        content: str,
-        metadata: dict[str, Any],
-    ) -> Message:
-        message = Message(
-            tenant_id=tenant_id,
-            conversation_id=conversation_id,
-            role=role,
-            content=content,
-            message_metadata=metadata,
-        )
-        session.add(message)
-        await session.flush()
-        return message
+    async def create_messages(
+        self, session: AsyncSession, rows: Sequence[dict[str, Any]]
+    ) -> list[Message]:
+        """Insert message rows in one executemany and return them in input order."""
+        if not rows:
+            return []
+        stmt = insert(Message).returning(Message, sort_by_parameter_order=True)
+        result = await session.scalars(stmt, list(rows))
+        return list(result.all())
 
-    async def update_message_embedding(
+    async def bulk_update_message_embeddings(
         self,
         session: AsyncSession,
-        message_id: UUID,
+        rows: Sequence[tuple[UUID, list[float] | None, float | None, str]],
         *,
-        embedding: list[float] | None,
-        importance_score: float | None,
-        status: str,
-    ) -> Message | None:
-        stmt = (
-            update(Message)
-            .where(Message.id == message_id)
-            .values(
-                embedding=embedding,
-                importance_score=importance_score,
-                embedding_status=status,
-                updated_at=datetime.now(timezone.utc),
-            )
-            .returning(Message)
+        normalized: bool = False,
+    ) -> None:
+        """Write (message_id, embedding, importance_score, status) rows in one executemany."""
+        if not rows:
+            return
+        now = datetime.now(timezone.utc)
+        await session.execute(
+            update(Message),
+            [
+                {
+                    "id": message_id,
+                    "embedding": embedding,
+                    "embedding_normalized": normalized and embedding is not None,
+                    "importance_score": importance_score,
+                    "embedding_status": status,
+                    "updated_at": now,
+                }
+                for message_id, embedding, importance_score, status in rows
+            ],
         )
-        result = await session.execute(stmt)
-        return result.scalar_one_or_none()
 
     async def get_message(self, session: AsyncSession, message_id: UUID) -> Message | None:
         stmt = select(Message).where(Message.id == message_id)
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_messages(
+        self, session: AsyncSession, message_ids: Sequence[UUID]
+    ) -> Sequence[Message]:
+        if not message_ids:
+            return []
+        stmt = select(Message).where(Message.id.in_(message_ids))
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
     async def list_active_messages(
         self,
         session: AsyncSession,
@@ -74,19 +75,52 @@ class MemoryRepository:
         importance_min: float | None,
         limit: int,
     ) -> Sequence[Message]:
-        stmt: Select[tuple[Message]] = select(Message).where(
-            Message.tenant_id == tenant_id,
-            Message.archived.is_(False),
-            Message.embedding_status == "completed",
-        )
-        if conversation_id:
-            stmt = stmt.where(Message.conversation_id == conversation_id)
-        if importance_min is not None:
-            stmt = stmt.where(Message.importance_score >= importance_min)
-        stmt = stmt.order_by(Message.created_at.desc()).limit(limit)
+        stmt = _active_messages_query(tenant_id, conversation_id, importance_min, limit)
         result = await session.execute(stmt)
         return result.scalars().all()
 
+    async def stream_active_messages(
+        self,
+        session: AsyncSession,
+        *,
+        tenant_id: str,
+        conversation_id: str | None,
+        importance_min: float | None,
+        limit: int,
+        batch_size: int = 256,
+    ) -> AsyncIterator[Sequence[Message]]:
+        """Yield list_active_messages results in chunks from a server-side cursor."""
+        stmt = _active_messages_query(tenant_id, conversation_id, importance_min, limit)
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.scalars().partitions():
+            yield partition
+
+    async def list_tenant_embeddings(
+        self,
+        session: AsyncSession,
+        tenant_id: str,
+        *,
+        message_ids: Sequence[UUID] | None = None,
+    ) -> Sequence[tuple[UUID, str, list[float], datetime]]:
+        """Return (id, conversation_id, embedding, updated_at) for searchable messages."""
+        stmt = select(
+            Message.id, Message.conversation_id, Message.embedding, Message.updated_at
+        ).where(*_searchable_criteria(tenant_id))
+        if message_ids is not None:
+            stmt = stmt.where(Message.id.in_(message_ids))
+        result = await session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    async def list_embedding_versions(
+        self, session: AsyncSession, tenant_id: str, *, updated_since: datetime | None
+    ) -> Sequence[tuple[UUID, datetime]]:
+        """(id, updated_at) of searchable messages changed since ``updated_since``."""
+        stmt = select(Message.id, Message.updated_at).where(*_searchable_criteria(tenant_id))
+        if updated_since is not None:
+            stmt = stmt.where(Message.updated_at >= updated_since)
+        result = await session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
     async def search_similar_messages(
         self,
         session: AsyncSession,
@@ -119,15 +153,15 @@ class MemoryRepository:
         result = await session.execute(stmt)
         return result.scalars().all()
 
-    async def enqueue_embedding_job(
-        self,
-        session: AsyncSession,
-        message_id: UUID,
-    ) -> EmbeddingJob:
-        job = EmbeddingJob(message_id=message_id, status="pending")
-        session.add(job)
-        await session.flush()
-        return job
+    async def enqueue_embedding_jobs(
+        self, session: AsyncSession, message_ids: Sequence[UUID]
+    ) -> None:
+        if not message_ids:
+            return
+        await session.execute(
+            insert(EmbeddingJob),
+            [{"message_id": message_id, "status": "pending"} for message_id in message_ids],
+        )
 
     async def claim_embedding_jobs(
         self,
@@ -163,32 +197,38 @@ class MemoryRepository:
         await session.flush()
         return jobs
 
-    async def get_embedding_job(self, session: AsyncSession, job_id: UUID) -> EmbeddingJob | None:
-        stmt = select(EmbeddingJob).where(EmbeddingJob.id == job_id)
-        result = await session.execute(stmt)
-        return result.scalar_one_or_none()
+    async def release_embedding_jobs(
+        self, session: AsyncSession, job_ids: Sequence[UUID]
+    ) -> None:
+        """Return claimed jobs to pending without charging them an attempt."""
+        if not job_ids:
+            return
+        await session.execute(
+            update(EmbeddingJob)
+            .where(EmbeddingJob.id.in_(job_ids), EmbeddingJob.status == "running")
+            .values(
+                status="pending",
+                attempts=EmbeddingJob.attempts - 1,
+                updated_at=datetime.now(timezone.utc),
+            )
+        )
 
-    async def update_embedding_job(
+    async def bulk_update_embedding_jobs(
         self,
         session: AsyncSession,
-        message_id: UUID | None = None,
-        job_id: UUID | None = None,
-        *,
-        status: str,
-        error: str | None = None,
+        rows: Sequence[tuple[UUID, str, str | None]],
     ) -> None:
-        if message_id is None and job_id is None:  # pragma: no cover - guardrail
-            raise ValueError("message_id or job_id is required")
-        stmt = update(EmbeddingJob).values(
-            status=status,
-            last_error=error,
-            updated_at=datetime.now(timezone.utc),
+        """Write (job_id, status, error) rows in one executemany."""
+        if not rows:
+            return
+        now = datetime.now(timezone.utc)
+        await session.execute(
+            update(EmbeddingJob),
+            [
+                {"id": job_id, "status": status, "last_error": error, "updated_at": now}
+                for job_id, status, error in rows
+            ],
         )
-        if message_id is not None:
-            stmt = stmt.where(EmbeddingJob.message_id == message_id)
-        if job_id is not None:
-            stmt = stmt.where(EmbeddingJob.id == job_id)
-        await session.execute(stmt)
 
     async def upsert_retention_policy(
         self,
@@ -228,65 +268,91 @@ class MemoryRepository:
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def archive_candidates(
+    async def archive_matching(
         self,
         session: AsyncSession,
         *,
         tenant_id: str,
         older_than_days: int,
         importance_threshold: float,
-    ) -> Sequence[Message]:
-        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
-        stmt = select(Message).where(
-            Message.tenant_id == tenant_id,
-            Message.archived.is_(False),
-            (
-                (Message.importance_score <= importance_threshold)
-                | (Message.created_at <= cutoff)
-            ),
-        )
-        result = await session.execute(stmt)
-        return result.scalars().all()
-
-    async def move_to_archive(
-        self, session: AsyncSession, *, messages: Sequence[Message], reason: str
+        reason: str,
     ) -> int:
-        count = 0
-        for message in messages:
-            archived = ArchivedMessage(
-                id=message.id,
-                tenant_id=message.tenant_id,
-                conversation_id=message.conversation_id,
-                role=message.role,
-                content=message.content,
-                metadata=message.message_metadata,
-                importance_score=message.importance_score,
-                archive_reason=reason,
+        """Copy matching messages into the archive and flag them, without loading rows."""
+        criteria = _archive_criteria(tenant_id, older_than_days, importance_threshold)
+        source = select(
+            Message.id,
+            Message.tenant_id,
+            Message.conversation_id,
+            Message.role,
+            Message.content,
+            Message.message_metadata,
+            Message.importance_score,
+            literal(datetime.now(timezone.utc), DateTime(timezone=True)),
+            literal(reason),
+        ).where(*criteria)
+        await session.execute(
+            insert(ArchivedMessage).from_select(
+                [
+                    ArchivedMessage.id,
+                    ArchivedMessage.tenant_id,
+                    ArchivedMessage.conversation_id,
+                    ArchivedMessage.role,
+                    ArchivedMessage.content,
+                    ArchivedMessage.message_metadata,
+                    ArchivedMessage.importance_score,
+                    ArchivedMessage.archived_at,
+                    ArchivedMessage.archive_reason,
+                ],
+                source,
             )
-            session.add(archived)
-            message.archived = True
-            count += 1
-        await session.flush()
-        return count
+        )
+        # Flag only rows that were actually copied. Re-evaluating the criteria here could
+        # catch a row that started matching after the INSERT and lose it on delete.
+        copied = select(ArchivedMessage.id).where(ArchivedMessage.tenant_id == tenant_id)
+        result = await session.execute(
+            update(Message)
+            .where(
+                Message.tenant_id == tenant_id,
+                Message.archived.is_(False),
+                Message.id.in_(copied),
+            )
+            .values(archived=True)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
 
     async def delete_archived(
         self, session: AsyncSession, *, older_than_days: int, tenant_id: str
     ) -> int:
-        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
-        stmt = (
-            select(ArchivedMessage)
-            .where(
-                ArchivedMessage.tenant_id == tenant_id,
-                ArchivedMessage.archived_at <= cutoff,
-            )
-            .with_for_update()
+        result = await session.execute(
+            delete(ArchivedMessage)
+            .where(*_delete_criteria(tenant_id, older_than_days))
+            .execution_options(synchronize_session=False)
         )
-        result = await session.execute(stmt)
-        rows = result.scalars().all()
-        deleted = len(rows)
-        for row in rows:
-            await session.delete(row)
-        return deleted
+        return result.rowcount
+
+    async def count_archivable(
+        self,
+        session: AsyncSession,
+        *,
+        tenant_id: str,
+        older_than_days: int,
+        importance_threshold: float,
+    ) -> int:
+        """Number of messages ``archive_matching`` would archive."""
+        stmt = select(func.count()).select_from(Message).where(
+            *_archive_criteria(tenant_id, older_than_days, importance_threshold)
+        )
+        return (await session.execute(stmt)).scalar_one()
+
+    async def count_deletable(
+        self, session: AsyncSession, *, older_than_days: int, tenant_id: str
+    ) -> int:
+        """Number of archived messages ``delete_archived`` would delete."""
+        stmt = select(func.count()).select_from(ArchivedMessage).where(
+            *_delete_criteria(tenant_id, older_than_days)
+        )
+        return (await session.execute(stmt)).scalar_one()
 
     async def count_messages(self, session: AsyncSession, tenant_id: str) -> int:
         stmt = select(func.count()).select_from(Message).where(Message.tenant_id == tenant_id)
@@ -297,3 +363,44 @@ class MemoryRepository:
         stmt = select(Message.tenant_id).distinct()
         result = await session.execute(stmt)
         return [row[0] for row in result.fetchall()]
+
+
+def _searchable_criteria(tenant_id: str):
+    return (
+        Message.tenant_id == tenant_id,
+        Message.archived.is_(False),
+        Message.embedding.is_not(None),
+        Message.embedding_status == "completed",
+    )
+
+
+def _archive_criteria(tenant_id: str, older_than_days: int, importance_threshold: float):
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    return (
+        Message.tenant_id == tenant_id,
+        Message.archived.is_(False),
+        (Message.importance_score <= importance_threshold) | (Message.created_at <= cutoff),
+    )
+
+
+def _delete_criteria(tenant_id: str, older_than_days: int):
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    return (
+        ArchivedMessage.tenant_id == tenant_id,
+        ArchivedMessage.archived_at <= cutoff,
+    )
+
+
+def _active_messages_query(
+    tenant_id: str, conversation_id: str | None, importance_min: float | None, limit: int
+) -> Select[tuple[Message]]:
+    stmt = select(Message).where(
+        Message.tenant_id == tenant_id,
+        Message.archived.is_(False),
+        Message.embedding_status == "completed",
+    )
+    if conversation_id:
+        stmt = stmt.where(Message.conversation_id == conversation_id)
+    if importance_min is not None:
+        stmt = stmt.where(Message.importance_score >= importance_min)
+    return stmt.order_by(Message.created_at.desc()).limit(limit)
@@ -33,3 +33,12 @@ async def search_memories(
         candidate_limit=candidate_limit,
     )
     return await service.retrieve(session, params)
+
+
+@router.post("/search", response_model=MemorySearchResponse)
+async def search_memories_with_body(
+    params: MemorySearchParams,
+    session: AsyncSession = Depends(get_read_session),
+) -> MemorySearchResponse:
+    """Search with a JSON body; accepts a precomputed ``query_embedding``."""
+    return await service.retrieve(session, params)
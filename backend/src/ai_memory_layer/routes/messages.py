@@ -55,7 +55,16 @@ async def create_messages_batch(
     logger = get_logger(component=__name__)
     created = []
     errors = []
-    
+
+    try:
+        created = await service.ingest_many(session, payload.messages)
+        response.status_code = status.HTTP_201_CREATED
+        return MessageBatchResponse(created=created, updated=[], deleted=[], errors=[])
+    except Exception:
+        # Fall back to per-message ingest so one bad row doesn't fail the whole batch.
+        logger.exception("batch_ingest_failed", count=len(payload.messages))
+        await session.rollback()
+
     for idx, msg_data in enumerate(payload.messages):
         try:
             result = await service.ingest(session, msg_data)
@@ -135,7 +144,7 @@ async def update_message(
         # For now, just mark as pending if async embeddings are enabled
         if service.settings.async_embeddings:
             message.embedding_status = "pending"
-            await service.repository.enqueue_embedding_job(session, message.id)
+            await service.repository.enqueue_embedding_jobs(session, [message.id])
     
     if "metadata" in update_data and update_data["metadata"] is not None:
         message.message_metadata = sanitize_metadata(update_data["metadata"])
@@ -186,6 +195,7 @@ async def update_messages_batch(
     
     # Track updated messages for response
     updated_messages = []
+    reembed_ids = []
     
     for batch_update in payload.updates:
         try:
@@ -202,7 +212,7 @@ async def update_messages_batch(
                 message.content = update_data["content"]
                 if service.settings.async_embeddings:
                     message.embedding_status = "pending"
-                    await service.repository.enqueue_embedding_job(session, message.id)
+                    reembed_ids.append(message.id)
             
             if "metadata" in update_data and update_data["metadata"] is not None:
                 message.message_metadata = sanitize_metadata(update_data["metadata"])
@@ -233,6 +243,7 @@ async def update_messages_batch(
     # Flush all changes at once for better performance
     if updated_messages:
         await session.flush()
+    await service.repository.enqueue_embedding_jobs(session, reembed_ids)
     
     await session.commit()
     
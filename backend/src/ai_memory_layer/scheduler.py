@@ -24,11 +24,13 @@ class RetentionScheduler:
         service: RetentionService | None = None,
         interval_seconds: int | None = None,
         tenant_ids: Sequence[str] | None = None,
+        max_parallel: int | None = None,
     ) -> None:
         settings = get_settings()
         self.interval = interval_seconds if interval_seconds is not None else settings.retention_schedule_seconds
         self.tenants = list(tenant_ids if tenant_ids is not None else settings.retention_tenants)
         self.service = service or RetentionService()
+        self.max_parallel = max(1, max_parallel or settings.retention_max_parallel)
         self.repository = MemoryRepository()
         self._task: asyncio.Task | None = None
         self._stopped = asyncio.Event()
@@ -66,7 +68,16 @@ class RetentionScheduler:
         if self.tenants == ["*"]:
             async with session_scope() as session:
                 tenant_list = list(await self.repository.list_tenants(session))
-        for tenant in tenant_list:
-            async with session_scope() as session:
-                await self.service.run(session, tenant_id=tenant)
+        # Tenants are independent, so overlap their DB round trips with a bounded fan-out.
+        semaphore = asyncio.Semaphore(self.max_parallel)
+
+        async def _run_tenant(tenant: str) -> None:
+            async with semaphore:
+                try:
+                    async with session_scope() as session:
+                        await self.service.run(session, tenant_id=tenant)
+                except Exception:
+                    logger.exception("retention_tenant_failed", tenant_id=tenant)
+
+        await asyncio.gather(*(_run_tenant(tenant) for tenant in tenant_list))
         logger.debug("retention_scheduler_cycle_completed", tenants=tenant_list)
@@ -6,7 +6,9 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from ai_memory_layer.config import get_settings
 
 
 class MemorySearchParams(BaseModel):
@@ -16,6 +18,17 @@ class MemorySearchParams(BaseModel):
     top_k: int = Field(default=5, ge=1, le=20)
     importance_min: float | None = Field(default=None, ge=0.0, le=1.0)
     candidate_limit: int = Field(default=200, ge=1, le=1000)
+    query_embedding: list[float] | None = None
+
+    @field_validator("query_embedding")
+    @classmethod
+    def _check_dimensions(cls, value: list[float] | None) -> list[float] | None:
+        if value is None:
+            return None
+        expected = get_settings().embedding_dimensions
+        if len(value) != expected:
+            raise ValueError(f"query_embedding must have {expected} dimensions")
+        return value
 
 
 class MemorySearchResult(BaseModel):
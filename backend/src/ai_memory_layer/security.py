@@ -51,7 +51,7 @@ async def get_current_user_from_api_key(
     
     # First check legacy API keys from config
     settings = get_settings()
-    if settings.api_keys and api_key in settings.api_keys:
+    if api_key in settings.api_key_set:
         # Legacy API key - return None (no user association)
         return None
     
@@ -108,7 +108,7 @@ async def require_api_key(api_key: str | None = Security(API_KEY_HEADER)) -> str
     settings = get_settings()
     if not settings.api_keys:
         return None
-    if api_key and api_key in settings.api_keys:
+    if api_key and api_key in settings.api_key_set:
         return api_key
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
 
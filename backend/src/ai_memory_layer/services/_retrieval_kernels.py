@@ -0,0 +1,101 @@
+"""Optional Numba kernels for retrieval scoring.
+
+``score_candidates`` and ``top_k_indices`` are ``None`` when numba is not installed; callers
+fall back to NumPy.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Callable
+
+import numpy as np
+
+# Below this many candidates the NumPy path is already fast and JIT dispatch is not worth it.
+JIT_MIN_CANDIDATES = 256
+
+score_candidates: Callable[..., Any] | None = None
+top_k_indices: Callable[..., Any] | None = None
+
+try:  # pragma: no cover - optional dependency
+    from numba import njit, prange
+except ImportError:  # pragma: no cover
+    njit = None
+
+if njit is not None:  # pragma: no cover - exercised only when numba is installed
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _score_candidates(
+        matrix, rows, query, importance, ages, similarity_weight, importance_weight,
+        decay_weight, decay_seconds,
+    ):
+        count = importance.shape[0]
+        similarities = np.zeros(count, dtype=np.float64)
+        decays = np.empty(count, dtype=np.float64)
+        scores = np.empty(count, dtype=np.float64)
+        dimensions = query.shape[0]
+        for i in prange(rows.shape[0]):
+            total = 0.0
+            for j in range(dimensions):
+                total += matrix[i, j] * query[j]
+            similarities[rows[i]] = total
+        for i in prange(count):
+            decay = math.exp(-ages[i] / decay_seconds)
+            decays[i] = decay
+            scores[i] = (
+                similarities[i] * similarity_weight
+                + importance[i] * importance_weight
+                + decay * decay_weight
+            )
+        return scores, similarities, decays
+
+    score_candidates = _score_candidates
+
+    @njit(cache=True)
+    def _worse(scores, a, b):
+        # Lower score loses; on ties the later candidate loses, matching a stable sort.
+        return scores[a] < scores[b] or (scores[a] == scores[b] and a > b)
+
+    @njit(cache=True)
+    def _sift_down(heap, size, scores, position):
+        while True:
+            left = 2 * position + 1
+            if left >= size:
+                return
+            child = left
+            right = left + 1
+            if right < size and _worse(scores, heap[right], heap[left]):
+                child = right
+            if not _worse(scores, heap[child], heap[position]):
+                return
+            heap[position], heap[child] = heap[child], heap[position]
+            position = child
+
+    @njit(cache=True)
+    def _top_k_indices(scores, k):
+        """Indices of the k best scores, best first, using a size-k min-heap."""
+        heap = np.empty(k, dtype=np.intp)
+        size = 0
+        for i in range(scores.shape[0]):
+            if size < k:
+                heap[size] = i
+                position = size
+                size += 1
+                while position > 0:
+                    parent = (position - 1) // 2
+                    if not _worse(scores, heap[position], heap[parent]):
+                        break
+                    heap[position], heap[parent] = heap[parent], heap[position]
+                    position = parent
+            elif _worse(scores, heap[0], i):
+                heap[0] = i
+                _sift_down(heap, size, scores, 0)
+        order = np.empty(size, dtype=np.intp)
+        for slot in range(size - 1, -1, -1):
+            order[slot] = heap[0]
+            size -= 1
+            heap[0] = heap[size]
+            _sift_down(heap, size, scores, 0)
+        return order
+
+    top_k_indices = _top_k_indices
@@ -3,14 +3,22 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import hashlib
 import time
 import json
-from typing import Any
+from typing import Any, Sequence
+
+import numpy as np
 
 from ai_memory_layer.config import get_settings
 from ai_memory_layer.logging import get_logger
 
+try:  # pragma: no cover - optional dependency
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
 logger = get_logger(component="cache")
 
 
@@ -24,6 +32,17 @@ class CacheBackend:
     async def delete_prefix(self, prefix: str) -> None:  # pragma: no cover
         raise NotImplementedError
 
+    async def get_many(self, keys: Sequence[str]) -> list[Any]:
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, entries: Sequence[tuple[str, Any, float]]) -> None:
+        for key, value, ttl in entries:
+            await self.set(key, value, ttl)
+
+    async def delete_prefixes(self, prefixes: Sequence[str]) -> None:
+        for prefix in prefixes:
+            await self.delete_prefix(prefix)
+
 
 class InMemoryCache(CacheBackend):
     """Lightweight, asyncio-safe TTL cache."""
@@ -35,14 +54,22 @@ class InMemoryCache(CacheBackend):
 
     async def get(self, key: str) -> Any | None:
         async with self._lock:
-            item = self._store.get(key)
-            if not item:
-                return None
-            expires_at, value = item
-            if expires_at < time.time():
-                self._store.pop(key, None)
-                return None
-            return value
+            return self._get(key, time.time())
+
+    async def get_many(self, keys: Sequence[str]) -> list[Any]:
+        async with self._lock:
+            now = time.time()
+            return [self._get(key, now) for key in keys]
+
+    def _get(self, key: str, now: float) -> Any | None:
+        item = self._store.get(key)
+        if not item:
+            return None
+        expires_at, value = item
+        if expires_at < now:
+            self._store.pop(key, None)
+            return None
+        return value
 
     async def set(self, key: str, value: Any, ttl: float) -> None:
         async with self._lock:
@@ -53,9 +80,13 @@ class InMemoryCache(CacheBackend):
             self._store[key] = (time.time() + ttl, value)
 
     async def delete_prefix(self, prefix: str) -> None:
+        await self.delete_prefixes([prefix])
+
+    async def delete_prefixes(self, prefixes: Sequence[str]) -> None:
+        prefixes = tuple(prefixes)
         async with self._lock:
             for key in list(self._store.keys()):
-                if key.startswith(prefix):
+                if key.startswith(prefixes):
                     self._store.pop(key, None)
 
 
@@ -74,18 +105,55 @@ class RedisCache(CacheBackend):
         return f"{self.prefix}:{key}"
 
     async def get(self, key: str) -> Any | None:
-        raw = await self.redis.get(self._key(key))
-        if raw is None:
-            return None
-        return json.loads(raw)
+        return _loads(await self.redis.get(self._key(key)))
 
     async def set(self, key: str, value: Any, ttl: float) -> None:
-        await self.redis.set(self._key(key), json.dumps(value), ex=ttl)
+        await self.redis.set(self._key(key), _dumps(value), ex=ttl)
+
+    async def get_many(self, keys: Sequence[str]) -> list[Any]:
+        if not keys:
+            return []
+        raws = await self.redis.mget([self._key(key) for key in keys])
+        return [_loads(raw) for raw in raws]
+
+    async def set_many(self, entries: Sequence[tuple[str, Any, float]]) -> None:
+        if not entries:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value, ttl in entries:
+                pipe.set(self._key(key), _dumps(value), ex=ttl)
+            await pipe.execute()
 
     async def delete_prefix(self, prefix: str) -> None:
-        scan_prefix = f"{self.prefix}:{prefix}*"
-        async for match in self.redis.scan_iter(match=scan_prefix):
-            await self.redis.delete(match)
+        await self.delete_prefixes([prefix])
+
+    async def delete_prefixes(self, prefixes: Sequence[str]) -> None:
+        matches = []
+        for prefix in prefixes:
+            async for match in self.redis.scan_iter(match=f"{self.prefix}:{prefix}*"):
+                matches.append(match)
+        if matches:
+            await self.redis.delete(*matches)
+
+
+# MessagePack payloads are tagged so entries written as JSON stay readable.
+_MSGPACK_TAG = b"\x00mp"
+
+
+def _dumps(value: Any) -> bytes:
+    if msgpack is not None:
+        return _MSGPACK_TAG + msgpack.packb(value, use_bin_type=True)
+    return json.dumps(value).encode("utf-8")
+
+
+def _loads(raw: bytes | None) -> Any | None:
+    if raw is None:
+        return None
+    if raw[:3] == _MSGPACK_TAG:
+        if msgpack is None:
+            return None
+        return msgpack.unpackb(raw[3:], raw=False)
+    return json.loads(raw)
 
 
 def _default_backend() -> CacheBackend:
@@ -97,6 +165,23 @@ def _default_backend() -> CacheBackend:
     return InMemoryCache(max_items=settings.cache_max_items)
 
 
+def encode_embedding(embedding: Sequence[float]) -> str:
+    """Pack an embedding as base64 float32 bytes, about 4x smaller than a JSON float list."""
+    return base64.b64encode(np.asarray(embedding, dtype="<f4").tobytes()).decode("ascii")
+
+
+def decode_embedding(raw: str) -> list[float]:
+    return np.frombuffer(base64.b64decode(raw), dtype="<f4").tolist()
+
+
+def decode_cached_embedding(raw: Any) -> list[float] | None:
+    if raw is None:
+        return None
+    if isinstance(raw, list):  # entries written before embeddings were packed
+        return raw
+    return decode_embedding(raw)
+
+
 class CacheService:
     """High-level cache tailored for retrieval and embeddings."""
 
@@ -106,6 +191,10 @@ class CacheService:
         self.backend = backend or _default_backend()
         self.search_ttl = settings.cache_search_ttl_seconds
         self.embedding_ttl = settings.cache_embedding_ttl_seconds
+        self.query_embedding_ttl = settings.cache_query_embedding_ttl_seconds
+        self.invalidate_coalesce_seconds = settings.cache_invalidate_coalesce_ms / 1000
+        self._pending_invalidations: set[str] = set()
+        self._invalidate_task: asyncio.Task | None = None
 
     def search_key(
         self,
@@ -115,23 +204,30 @@ class CacheService:
         query: str,
         top_k: int,
         candidate_limit: int,
+        query_embedding: list[float] | None = None,
     ) -> str:
-        raw = "|".join(
-            [
-                tenant_id,
-                conversation_id or "*",
-                str(top_k),
-                str(candidate_limit),
-                query,
-            ]
-        )
+        parts = [
+            tenant_id,
+            conversation_id or "*",
+            str(top_k),
+            str(candidate_limit),
+            query,
+        ]
+        if query_embedding is not None:
+            parts.append(",".join(map(repr, query_embedding)))
+        raw = "|".join(parts)
         digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
         return f"search:{tenant_id}:{conversation_id or '*'}:{digest}"
 
     def embedding_key(self, text: str) -> str:
-        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        # Cache keys only need collision resistance, not cryptographic strength.
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
         return f"embedding:{digest}"
 
+    def query_embedding_key(self, text: str) -> str:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        return f"query_embedding:{digest}"
+
     async def get(self, key: str) -> Any | None:
         if not self.enabled:
             return None
@@ -142,6 +238,24 @@ class CacheService:
             return
         await self.backend.set(key, value, ttl or self.search_ttl)
 
+    async def get_many(self, keys: Sequence[str]) -> list[Any]:
+        """Read several keys in one backend round trip."""
+        if not self.enabled:
+            return [None] * len(keys)
+        return await self.backend.get_many(keys)
+
+    async def set_many(self, entries: Sequence[tuple[str, Any, float]]) -> None:
+        """Write (key, value, ttl) entries in one backend round trip."""
+        if not self.enabled:
+            return
+        await self.backend.set_many(entries)
+
+    async def get_embedding(self, key: str) -> list[float] | None:
+        return decode_cached_embedding(await self.get(key))
+
+    async def set_embedding(self, key: str, embedding: Sequence[float], ttl: float) -> None:
+        await self.set(key, encode_embedding(embedding), ttl=ttl)
+
     async def invalidate_search(self, tenant_id: str, conversation_id: str | None = None) -> None:
         if not self.enabled:
             return
@@ -152,3 +266,39 @@ class CacheService:
             tenant_id=tenant_id,
             conversation_id=conversation_id,
         )
+
+    async def schedule_invalidate(
+        self, tenant_id: str, conversation_id: str | None = None
+    ) -> None:
+        """Queue a search invalidation; a burst of them is flushed together shortly after."""
+        if not self.enabled:
+            return
+        if self.invalidate_coalesce_seconds <= 0:
+            await self.invalidate_search(tenant_id, conversation_id)
+            return
+        self._pending_invalidations.add(f"search:{tenant_id}:{conversation_id or '*'}:")
+        if self._invalidate_task is None:
+            self._invalidate_task = asyncio.create_task(self._flush_after_delay())
+
+    async def flush_invalidations(self) -> None:
+        """Apply queued invalidations now instead of waiting for the coalescing window."""
+        task, self._invalidate_task = self._invalidate_task, None
+        if task is not None:
+            task.cancel()
+        await self._flush_pending()
+
+    async def _flush_after_delay(self) -> None:
+        await asyncio.sleep(self.invalidate_coalesce_seconds)
+        self._invalidate_task = None
+        await self._flush_pending()
+
+    async def _flush_pending(self) -> None:
+        prefixes, self._pending_invalidations = self._pending_invalidations, set()
+        if not prefixes:
+            return
+        try:
+            await self.backend.delete_prefixes(sorted(prefixes))
+        except Exception:
+            logger.exception("cache_invalidate_failed", scopes=len(prefixes))
+            return
+        logger.debug("cache_invalidated_batch", scopes=len(prefixes))
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timedelta, timezone
+import time
+from enum import IntEnum
 from typing import Any, Awaitable, Callable, TypeVar
 
 from ai_memory_layer.logging import get_logger
@@ -17,40 +18,67 @@ class CircuitOpenError(RuntimeError):
     """Raised when the circuit is open and calls are short-circuited."""
 
 
+class CircuitState(IntEnum):
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
 class CircuitBreaker:
     """Minimal circuit breaker to protect external dependencies."""
 
+    __slots__ = (
+        "failure_threshold",
+        "recovery_time",
+        "half_open_successes",
+        "request_timeout_seconds",
+        "state",
+        "failure_count",
+        "success_count",
+        "next_attempt_at",
+    )
+
     def __init__(
         self,
         *,
         failure_threshold: int = 5,
         recovery_time_seconds: int = 30,
         half_open_successes: int = 2,
+        request_timeout_seconds: float | None = None,
     ) -> None:
         self.failure_threshold = failure_threshold
-        self.recovery_time = timedelta(seconds=recovery_time_seconds)
+        self.recovery_time = float(recovery_time_seconds)
         self.half_open_successes = half_open_successes
-        self.state = "closed"
+        self.request_timeout_seconds = request_timeout_seconds
+        self.state = CircuitState.CLOSED
         self.failure_count = 0
         self.success_count = 0
-        self.next_attempt_at = datetime.now(timezone.utc)
+        # Monotonic deadline: immune to wall-clock jumps and cheaper than tz-aware datetimes.
+        self.next_attempt_at = time.monotonic()
 
     async def call(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
-        if self.state == "open":
-            if datetime.now(timezone.utc) < self.next_attempt_at:
+        if self.state is CircuitState.OPEN:
+            if time.monotonic() < self.next_attempt_at:
                 raise CircuitOpenError("circuit_open")
-            self.state = "half_open"
+            self.state = CircuitState.HALF_OPEN
 
         try:
-            result = await func(*args, **kwargs)
-            self._record_success()
-            return result
+            result = await asyncio.wait_for(
+                func(*args, **kwargs), timeout=self.request_timeout_seconds
+            )
+        except asyncio.TimeoutError as exc:
+            # A hung dependency counts as a failure; surface it like an open circuit so
+            # callers fall back immediately instead of waiting on retries.
+            self._record_failure()
+            raise CircuitOpenError("circuit_call_timeout") from exc
         except Exception:
             self._record_failure()
             raise
+        self._record_success()
+        return result
 
     def _record_success(self) -> None:
-        if self.state == "half_open":
+        if self.state is CircuitState.HALF_OPEN:
             self.success_count += 1
             if self.success_count >= self.half_open_successes:
                 self._close()
@@ -65,12 +93,12 @@ class CircuitBreaker:
             self._open()
 
     def _open(self) -> None:
-        self.state = "open"
-        self.next_attempt_at = datetime.now(timezone.utc) + self.recovery_time
-        logger.warning("circuit_opened", retry_after_seconds=self.recovery_time.total_seconds())
+        self.state = CircuitState.OPEN
+        self.next_attempt_at = time.monotonic() + self.recovery_time
+        logger.warning("circuit_opened", retry_after_seconds=self.recovery_time)
 
     def _close(self) -> None:
-        self.state = "closed"
+        self.state = CircuitState.CLOSED
         self.failure_count = 0
         self.success_count = 0
         logger.info("circuit_closed")
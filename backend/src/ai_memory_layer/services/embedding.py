@@ -4,10 +4,10 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
-import math
-from functools import lru_cache
-from typing import Any, Protocol, Sequence
+from functools import lru_cache, partial
+from typing import Any, Callable, Protocol, Sequence
 
+import numpy as np
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -29,6 +29,9 @@ class EmbeddingService(Protocol):
     async def embed(self, text: str) -> list[float]:
         ...
 
+    async def embed_many(self, texts: Sequence[str]) -> list[list[float]]:
+        ...
+
 
 class CircuitBreakerEmbeddingService:
 
@@ -38,20 +41,45 @@ class CircuitBreakerEmbeddingService:
         fallback: EmbeddingService | None = None,
         *,
         breaker: CircuitBreaker | None = None,
+        strict: bool = False,
     ) -> None:
         self.primary = primary
         self.fallback = fallback or MockEmbeddingService()
         self.breaker = breaker or CircuitBreaker()
+        self.strict = strict
+
+    def without_fallback(self) -> CircuitBreakerEmbeddingService:
+        """Same provider and breaker, but failures raise instead of returning mock vectors."""
+        return CircuitBreakerEmbeddingService(
+            self.primary, self.fallback, breaker=self.breaker, strict=True
+        )
 
     async def embed(self, text: str) -> list[float]:
         try:
             return await self.breaker.call(self.primary.embed, text)
         except CircuitOpenError:
             logger.warning("embedding_circuit_open", provider=type(self.primary).__name__)
+            if self.strict:
+                raise
         except Exception as exc:
             logger.error("embedding_provider_failed", error=str(exc))
+            if self.strict:
+                raise
         return await self.fallback.embed(text)
 
+    async def embed_many(self, texts: Sequence[str]) -> list[list[float]]:
+        try:
+            return await self.breaker.call(_embed_many, self.primary, texts)
+        except CircuitOpenError:
+            logger.warning("embedding_circuit_open", provider=type(self.primary).__name__)
+            if self.strict:
+                raise
+        except Exception as exc:
+            logger.error("embedding_provider_failed", error=str(exc))
+            if self.strict:
+                raise
+        return await _embed_many(self.fallback, texts)
+
 
 class MockEmbeddingService:
 
@@ -60,19 +88,33 @@ class MockEmbeddingService:
         self.dimensions = dimensions or settings.embedding_dimensions
 
     async def embed(self, text: str) -> list[float]:
-        digest = hashlib.sha256(text.encode("utf-8")).digest()
-        values = [b / 255 for b in digest]
-        repeats = math.ceil(self.dimensions / len(values))
-        raw = (values * repeats)[: self.dimensions]
-        return raw
+        return self._vectors([text])[0]
+
+    async def embed_many(self, texts: Sequence[str]) -> list[list[float]]:
+        return self._vectors(texts)
+
+    def _vectors(self, texts: Sequence[str]) -> list[list[float]]:
+        # Filler only, no security property needed: blake2b is faster than sha256 in pure software.
+        digests = b"".join(
+            hashlib.blake2b(text.encode("utf-8"), digest_size=32).digest() for text in texts
+        )
+        values = np.frombuffer(digests, dtype=np.uint8).reshape(len(texts), 32) / 255.0
+        # Tile the 32 digest values to exactly `dimensions` floats per text.
+        repeats = -(-self.dimensions // 32)
+        return np.tile(values, (1, repeats))[:, : self.dimensions].tolist()
 
 
 class SentenceTransformerEmbeddingService:
 
-    def __init__(self, model_name: str, dimensions: int) -> None:
+    def __init__(
+        self, model_name: str, dimensions: int, attempt_timeout_seconds: float | None = None
+    ) -> None:
         _load_sentence_transformer()
         self.model = _load_model(model_name)
         self.dimensions = dimensions
+        self.attempt_timeout = attempt_timeout_seconds
+        native_dim = self.model.get_sentence_embedding_dimension()  # type: ignore[attr-defined]
+        self._resize = _build_resizer(native_dim, dimensions)
 
     @retry(
         stop=stop_after_attempt(3),
@@ -82,21 +124,76 @@ class SentenceTransformerEmbeddingService:
     async def embed(self, text: str) -> list[float]:
         try:
             loop = asyncio.get_running_loop()
-            vector = await loop.run_in_executor(
-                None, lambda: self.model.encode(text, show_progress_bar=False)  # type: ignore[attr-defined]
+            vector = await asyncio.wait_for(
+                loop.run_in_executor(
+                    None, lambda: self.model.encode(text, show_progress_bar=False)  # type: ignore[attr-defined]
+                ),
+                timeout=_attempt_timeout(self.attempt_timeout, 1),
             )
             values = vector.tolist() if hasattr(vector, "tolist") else list(vector)
-            if len(values) != self.dimensions:
-                # pad/truncate to configured dimension
-                if len(values) > self.dimensions:
-                    values = values[: self.dimensions]
-                else:
-                    values.extend([0.0] * (self.dimensions - len(values)))
+            if self._resize is not None:
+                values = self._resize(values)
             return values
         except Exception as exc:
             logger.error("sentence_transformer_embedding_failed", error=str(exc), text_length=len(text))
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=5),
+        reraise=True,
+    )
+    async def embed_many(self, texts: Sequence[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        try:
+            loop = asyncio.get_running_loop()
+            matrix = await asyncio.wait_for(
+                loop.run_in_executor(
+                    None,
+                    lambda: self.model.encode(list(texts), show_progress_bar=False),  # type: ignore[attr-defined]
+                ),
+                timeout=_attempt_timeout(self.attempt_timeout, len(texts)),
+            )
+            rows = [row.tolist() if hasattr(row, "tolist") else list(row) for row in matrix]
+            if self._resize is not None:
+                rows = [self._resize(row) for row in rows]
+            return rows
+        except Exception as exc:
+            logger.error("sentence_transformer_embedding_failed", error=str(exc), batch_size=len(texts))
+            raise
+
+
+def _attempt_timeout(timeout: float | None, count: int) -> float | None:
+    """Budget for one provider attempt: ``timeout`` per ``embedding_batch_size`` texts."""
+    if timeout is None:
+        return None
+    batch_size = max(1, get_settings().embedding_batch_size)
+    return timeout * max(1, -(-count // batch_size))
+
+
+def _fit_dimensions(values: list[float], dimensions: int) -> list[float]:
+    """Pad with zeros or truncate to the configured dimension."""
+    if len(values) > dimensions:
+        return values[:dimensions]
+    if len(values) < dimensions:
+        values.extend([0.0] * (dimensions - len(values)))
+    return values
+
+
+def _build_resizer(
+    native_dim: int | None, dimensions: int
+) -> Callable[[list[float]], list[float]] | None:
+    """Pick the resize step once at load time; None means vectors already fit."""
+    if native_dim == dimensions:
+        return None
+    if native_dim is None:
+        return lambda values: _fit_dimensions(values, dimensions)
+    if native_dim > dimensions:
+        return lambda values: values[:dimensions]
+    padding = [0.0] * (dimensions - native_dim)
+    return lambda values: values + padding
+
 
 def _load_sentence_transformer():
     global SentenceTransformer  # noqa: PLW0603
@@ -118,14 +215,22 @@ def _load_model(model_name: str):
 
 class GoogleGeminiEmbeddingService:
 
-    def __init__(self, api_key: str, model_name: str = "models/embedding-001", dimensions: int = 768) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "models/embedding-001",
+        dimensions: int = 768,
+        attempt_timeout_seconds: float | None = None,
+    ) -> None:
         genai = _load_genai()
         if not api_key:
             raise ValueError("GEMINI_API_KEY is required for google_gemini provider")
             
         genai.configure(api_key=api_key)
+        self._genai = genai
         self.model_name = model_name
         self.dimensions = dimensions
+        self.attempt_timeout = attempt_timeout_seconds
 
     @retry(
         stop=stop_after_attempt(3),
@@ -136,7 +241,7 @@ class GoogleGeminiEmbeddingService:
         loop = asyncio.get_running_loop()
         
         def _call_gemini():
-            result = genai.embed_content(
+            result = self._genai.embed_content(
                 model=self.model_name,
                 content=text,
                 task_type="retrieval_document",
@@ -145,27 +250,148 @@ class GoogleGeminiEmbeddingService:
             return result['embedding']
 
         try:
-            values = await loop.run_in_executor(None, _call_gemini)
+            values = await asyncio.wait_for(
+                loop.run_in_executor(None, _call_gemini),
+                timeout=_attempt_timeout(self.attempt_timeout, 1),
+            )
             if len(values) != self.dimensions:
                 logger.warning(
                     "gemini_embedding_dimension_mismatch",
                     expected=self.dimensions,
                     actual=len(values)
                 )
-                if len(values) > self.dimensions:
-                    values = values[: self.dimensions]
-                else:
-                    values.extend([0.0] * (self.dimensions - len(values)))
+                values = _fit_dimensions(values, self.dimensions)
             return values
         except Exception as e:
             logger.error("gemini_embedding_failed", error=str(e), text_length=len(text))
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=5),
+        reraise=True,
+    )
+    async def embed_many(self, texts: Sequence[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+
+        def _call_gemini():
+            result = self._genai.embed_content(
+                model=self.model_name,
+                content=list(texts),
+                task_type="retrieval_document",
+            )
+            return result['embedding']
+
+        try:
+            rows = await asyncio.wait_for(
+                loop.run_in_executor(None, _call_gemini),
+                timeout=_attempt_timeout(self.attempt_timeout, len(texts)),
+            )
+            return [
+                row if len(row) == self.dimensions else _fit_dimensions(row, self.dimensions)
+                for row in rows
+            ]
+        except Exception as e:
+            logger.error("gemini_embedding_failed", error=str(e), batch_size=len(texts))
+            raise
+
+
+async def _embed_many(service: EmbeddingService, texts: Sequence[str]) -> list[list[float]]:
+    """Call ``embed_many`` when a provider has it, else embed concurrently one by one."""
+    embed_many = getattr(service, "embed_many", None)
+    if embed_many is not None:
+        return await embed_many(texts)
+    return list(await asyncio.gather(*(service.embed(text) for text in texts)))
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent ``embed`` calls into ``embed_many`` micro-batches.
+
+    Requests queue until ``batch_size`` is reached or ``max_wait_ms`` elapses. A wait of
+    zero flushes on the next loop iteration, batching only calls that are already
+    concurrent and adding no latency to a lone request.
+    """
+
+    def __init__(
+        self,
+        service: EmbeddingService,
+        *,
+        batch_size: int | None = None,
+        max_wait_ms: float | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.service = service
+        self.batch_size = max(1, batch_size or settings.embedding_batch_size)
+        wait_ms = max_wait_ms if max_wait_ms is not None else settings.embedding_batch_max_wait_ms
+        self.max_wait = max(0.0, wait_ms) / 1000
+        self._pending: list[tuple[str, asyncio.Future[list[float]]]] = []
+        self._timer: asyncio.Task | None = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[float]] = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.batch_size:
+            self._dispatch()
+        elif self._timer is None or self._timer.done():
+            self._timer = loop.create_task(self._dispatch_after_wait())
+        return await future
+
+    async def embed_many(self, texts: Sequence[str]) -> list[list[float]]:
+        return await _embed_many(self.service, texts)
+
+    async def _dispatch_after_wait(self) -> None:
+        await asyncio.sleep(self.max_wait)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start : start + self.batch_size]
+            task = asyncio.create_task(self._run_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+            task.add_done_callback(partial(_release_futures, batch))
+
+    async def _run_batch(self, batch: list[tuple[str, asyncio.Future[list[float]]]]) -> None:
+        # Longest first keeps similarly sized inputs together and reduces padding in the model.
+        order = sorted(range(len(batch)), key=lambda index: len(batch[index][0]), reverse=True)
+        try:
+            vectors = await _embed_many(self.service, [batch[index][0] for index in order])
+            if len(vectors) != len(batch):
+                raise RuntimeError(
+                    f"embedding provider returned {len(vectors)} vectors for {len(batch)} texts"
+                )
+            for index, vector in zip(order, vectors):
+                future = batch[index][1]
+                if not future.done():
+                    future.set_result(vector)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+
+
+def _release_futures(
+    batch: list[tuple[str, asyncio.Future[list[float]]]], _task: asyncio.Task
+) -> None:
+    """Fail callers a finished batch task left waiting, e.g. when it was cancelled."""
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(RuntimeError("embedding batch was cancelled"))
+
 
+@lru_cache(maxsize=4)
 def build_embedding_service(provider: str | None = None) -> EmbeddingService:
+    """Return a shared embedding service so every caller sees the same breaker state."""
     settings = get_settings()
     provider = provider or settings.embedding_provider
     fallback = MockEmbeddingService(dimensions=settings.embedding_dimensions)
+    # The call timeout bounds each retry attempt inside the provider, not the whole
+    # retried call, so one slow attempt does not void the provider's retry policy.
     breaker = CircuitBreaker(
         failure_threshold=settings.circuit_failure_threshold,
         recovery_time_seconds=settings.circuit_recovery_seconds,
@@ -176,6 +402,7 @@ def build_embedding_service(provider: str | None = None) -> EmbeddingService:
             base = SentenceTransformerEmbeddingService(
                 model_name=settings.embedding_model_name,
                 dimensions=settings.embedding_dimensions,
+                attempt_timeout_seconds=settings.circuit_call_timeout_seconds,
             )
         except Exception as exc:  # pragma: no cover - fallback for missing model
             logger.warning("sentence_transformer_unavailable_falling_back_to_mock", error=str(exc))
@@ -185,6 +412,7 @@ def build_embedding_service(provider: str | None = None) -> EmbeddingService:
                 api_key=settings.gemini_api_key or "",
                 model_name="models/embedding-001", 
                 dimensions=settings.embedding_dimensions,
+                attempt_timeout_seconds=settings.circuit_call_timeout_seconds,
             )
         except Exception as exc:
             logger.warning("google_gemini_unavailable_falling_back_to_mock", error=str(exc))
@@ -15,7 +15,7 @@ from ai_memory_layer.logging import get_logger
 logger = get_logger(component="health")
 
 
-@dataclass
+@dataclass(slots=True)
 class HealthReport:
     status: str
     database: str
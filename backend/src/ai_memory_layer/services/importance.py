@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Literal
+from typing import Literal, Sequence
+
+import numpy as np
 
 from ai_memory_layer.config import ImportanceWeights, get_settings
 
@@ -46,3 +48,32 @@ class ImportanceScorer:
             + explicit_component * self.weights.explicit
         )
         return max(0.0, min(score, 1.0))
+
+    def score_batch(
+        self,
+        *,
+        created_at: Sequence[datetime] | np.ndarray,
+        roles: Sequence[str],
+        explicit_importance: Sequence[float | None] | None = None,
+    ) -> np.ndarray:
+        """Vectorized ``score`` for a batch; returns a float64 array in the same order.
+
+        ``created_at`` may be datetimes or a ``datetime64`` array holding UTC times.
+        """
+        count = len(created_at)
+        now = datetime.now(timezone.utc)
+        if isinstance(created_at, np.ndarray) and created_at.dtype.kind == "M":
+            now64 = np.datetime64(now.replace(tzinfo=None), "us")
+            ages = (now64 - created_at) / np.timedelta64(1, "s")
+        else:
+            stamps = np.fromiter((stamp.timestamp() for stamp in created_at), np.float64, count)
+            ages = now.timestamp() - stamps
+        recency = np.maximum(0.0, 1.0 - ages / (60 * 60 * 24))
+        role = np.fromiter((self.role_weights.get(r, 0.5) for r in roles), np.float64, count)
+        score = recency * self.weights.recency + role * self.weights.role
+        if explicit_importance is not None:
+            explicit = np.fromiter(
+                (value or 0.0 for value in explicit_importance), np.float64, count
+            )
+            score += explicit * self.weights.explicit
+        return np.clip(score, 0.0, 1.0)
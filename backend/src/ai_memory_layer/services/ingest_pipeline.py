@@ -0,0 +1,218 @@
+"""Staged embedding pipeline: Score -> Embed -> Upsert over bounded queues."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import AbstractAsyncContextManager, suppress
+from dataclasses import dataclass
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ai_memory_layer.config import get_settings
+from ai_memory_layer.logging import get_logger
+from ai_memory_layer.models.memory import Message
+from ai_memory_layer.repositories.memory_repository import MemoryRepository
+from ai_memory_layer.services.message_service import MessageService
+
+logger = get_logger(component="ingest_pipeline")
+
+
+@dataclass(slots=True)
+class PipelineItem:
+    job_id: UUID
+    message: Message
+    importance: float | None = None
+    embedding: list[float] | None = None
+    status: str = "failed"
+    error: str | None = None
+
+
+class IngestPipeline:
+    """Persistent stage workers joined by bounded queues, so a slow stage applies backpressure."""
+
+    def __init__(
+        self,
+        *,
+        service: MessageService,
+        repository: MemoryRepository,
+        session_provider: Callable[[], AbstractAsyncContextManager[AsyncSession]],
+        queue_depth: int | None = None,
+        batch_size: int | None = None,
+        embed_workers: int | None = None,
+        upsert_batch_size: int | None = None,
+        flush_interval_ms: float | None = None,
+    ) -> None:
+        settings = get_settings()
+        depth = queue_depth or settings.pipeline_queue_depth
+        self.service = service
+        self.repository = repository
+        self.session_provider = session_provider
+        self.batch_size = batch_size or settings.embedding_job_batch_size
+        self.embed_workers = max(1, embed_workers or settings.embedding_job_concurrency)
+        self.upsert_batch_size = upsert_batch_size or settings.pipeline_upsert_batch_size
+        interval = (
+            settings.pipeline_flush_interval_ms if flush_interval_ms is None else flush_interval_ms
+        )
+        self.flush_interval = max(0.0, interval) / 1000
+        self.score_q: asyncio.Queue[PipelineItem] = asyncio.Queue(maxsize=depth)
+        self.embed_q: asyncio.Queue[PipelineItem] = asyncio.Queue(maxsize=depth)
+        self.upsert_q: asyncio.Queue[PipelineItem] = asyncio.Queue(maxsize=depth)
+        self._workers: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Spawn the stage workers once; they live until stop()."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._score_worker(), name="ingest-score"),
+            *(
+                asyncio.create_task(self._embed_worker(), name=f"ingest-embed-{index}")
+                for index in range(self.embed_workers)
+            ),
+            asyncio.create_task(self._upsert_worker(), name="ingest-upsert"),
+        ]
+
+    async def stop(self) -> None:
+        """Let queued items finish, then cancel the workers."""
+        if not self._workers:
+            return
+        await self.join()
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._workers = []
+
+    async def submit(self, job_id: UUID, message: Message) -> None:
+        """Queue a claimed job; blocks while the pipeline is full."""
+        await self.score_q.put(PipelineItem(job_id=job_id, message=message))
+
+    async def join(self) -> None:
+        await self.score_q.join()
+        await self.embed_q.join()
+        await self.upsert_q.join()
+
+    async def _score_worker(self) -> None:
+        while True:
+            batch = await self._take_batch(self.score_q, self.batch_size)
+            try:
+                try:
+                    scores = self.service._base_importance_batch(
+                        [item.message for item in batch]
+                    )
+                except Exception:
+                    logger.exception("ingest_score_failed", jobs=len(batch))
+                    scores = [self._fallback_importance(item.message) for item in batch]
+                for item, importance in zip(batch, scores):
+                    item.importance = importance
+                    await self.embed_q.put(item)
+            finally:
+                for _ in batch:
+                    self.score_q.task_done()
+
+    def _fallback_importance(self, message: Message) -> float | None:
+        """Score one message on its own, keeping the stored score if that fails too."""
+        try:
+            return self.service._base_importance(
+                message=message, explicit_importance=message.importance_score
+            )
+        except Exception:
+            return message.importance_score
+
+    async def _embed_worker(self) -> None:
+        while True:
+            batch = await self._take_batch(self.embed_q, self.batch_size)
+            try:
+                # Concurrent _embed_text calls coalesce into one embed_many via the batcher.
+                results = await asyncio.gather(
+                    *(
+                        self.service._embed_content(message=item.message, content=item.message.content)
+                        for item in batch
+                    ),
+                    return_exceptions=True,
+                )
+                for item, result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        item.error = str(result)
+                    else:
+                        item.embedding, item.status, item.error = result
+                    await self.upsert_q.put(item)
+            finally:
+                for _ in batch:
+                    self.embed_q.task_done()
+
+    async def _upsert_worker(self) -> None:
+        while True:
+            # Hold a partial batch briefly so bursts from several embed workers share a commit.
+            batch = await self._take_batch(
+                self.upsert_q, self.upsert_batch_size, self.flush_interval
+            )
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self.upsert_q.task_done()
+
+    async def _take_batch(
+        self, queue: asyncio.Queue[PipelineItem], size: int, wait: float = 0.0
+    ) -> list[PipelineItem]:
+        """Block for one item, then collect up to ``size`` until ``wait`` seconds elapse."""
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while len(batch) < size:
+            try:
+                batch.append(queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write(self, batch: list[PipelineItem]) -> None:
+        try:
+            async with self.session_provider() as session:
+                await self.repository.bulk_update_message_embeddings(
+                    session,
+                    [
+                        (item.message.id, item.embedding, item.importance, item.status)
+                        for item in batch
+                    ],
+                    normalized=True,
+                )
+                await self.repository.bulk_update_embedding_jobs(
+                    session, [(item.job_id, item.status, item.error) for item in batch]
+                )
+                await session.commit()
+        except Exception as exc:
+            logger.exception("ingest_upsert_failed", jobs=len(batch), error=str(exc))
+            with suppress(Exception):
+                async with self.session_provider() as session:
+                    await self.repository.bulk_update_embedding_jobs(
+                        session, [(item.job_id, "failed", str(exc)) for item in batch]
+                    )
+                    await session.commit()
+            return
+
+        index = self.service.vector_index
+        scopes = {(item.message.tenant_id, item.message.conversation_id) for item in batch}
+        if index is not None:
+            for item in batch:
+                if item.embedding is not None and item.status == "completed":
+                    index.add(
+                        item.message.tenant_id,
+                        item.message.id,
+                        item.message.conversation_id,
+                        item.embedding,
+                    )
+        for tenant_id, conversation_id in scopes:
+            await self.service.cache.schedule_invalidate(tenant_id, conversation_id)
@@ -5,15 +5,15 @@ from __future__ import annotations
 import asyncio
 from contextlib import AbstractAsyncContextManager, suppress
 from typing import Callable, Sequence
-from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ai_memory_layer.config import get_settings
 from ai_memory_layer.database import session_scope
 from ai_memory_layer.logging import get_logger
-from ai_memory_layer.models.memory import EmbeddingJob
+from ai_memory_layer.models.memory import EmbeddingJob, Message
 from ai_memory_layer.repositories.memory_repository import MemoryRepository
+from ai_memory_layer.services.ingest_pipeline import IngestPipeline
 from ai_memory_layer.services.message_service import MessageService
 
 logger = get_logger(component="embedding_job_queue")
@@ -37,17 +37,27 @@ class EmbeddingJobQueue:
         self.batch_size = batch_size or settings.embedding_job_batch_size
         self.max_attempts = settings.embedding_job_max_attempts
         self.retry_backoff_seconds = settings.embedding_job_retry_backoff_seconds
+        self._concurrency = max(1, settings.embedding_job_concurrency)
+        self._sem = asyncio.Semaphore(self._concurrency)
         self.repository = repository or MemoryRepository()
         self.service = service or MessageService()
         self.session_provider = session_provider or session_scope
         self._task: asyncio.Task | None = None
+        self._claim_lock = asyncio.Lock()
         self._stop_event = asyncio.Event()
+        self.pipeline = IngestPipeline(
+            service=self.service,
+            repository=self.repository,
+            session_provider=self.session_provider,
+            batch_size=self.batch_size,
+            embed_workers=self._concurrency,
+        )
 
     async def start(self) -> None:
-        """Start the background job processor."""
-        if not get_settings().async_embeddings:
-            logger.info("embedding_job_queue_disabled")
-            return
+        """Start the background job processor.
+
+        It also runs with inline embeddings, where it retries messages whose embedding failed.
+        """
         if self._task:
             return
         self._stop_event.clear()
@@ -55,21 +65,29 @@ class EmbeddingJobQueue:
         logger.info("embedding_job_queue_started")
 
     async def stop(self) -> None:
-        """Stop the background processor."""
+        """Stop the background processor, letting jobs already in the pipeline finish."""
         if not self._task:
             return
         self._stop_event.set()
-        self._task.cancel()
-        with suppress(asyncio.CancelledError):
-            await self._task
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        except asyncio.CancelledError:  # pragma: no cover - cancellation path
+            pass
         self._task = None
+        await self.pipeline.stop()
+        await self.service.cache.flush_invalidations()
         logger.info("embedding_job_queue_stopped")
 
     async def _run(self) -> None:
         """Run the job loop."""
+        await self.pipeline.start()
         try:
             while not self._stop_event.is_set():
-                processed = await self.drain_once()
+                processed = await self._feed_pipeline()
                 # If work was processed, loop immediately to drain remaining jobs.
                 # Otherwise, sleep for the configured poll interval.
                 sleep_for = 0.0 if processed else self.poll_interval
@@ -89,14 +107,117 @@ class EmbeddingJobQueue:
     async def drain_once(self) -> int:
         """Process a batch of jobs and return how many were handled."""
         jobs = await self._claim_jobs()
-        processed = 0
-        for job in jobs:
-            await self._process_job(job.id)
-            processed += 1
-        return processed
+        return await self._process_batch(jobs)
 
-    async def _claim_jobs(self) -> Sequence[EmbeddingJob]:
+    async def _feed_pipeline(self) -> int:
+        """Claim a batch and hand it to the pipeline; blocks while the pipeline is full."""
+        jobs = await self._claim_jobs()
+        if not jobs:
+            return 0
+        unsubmitted = list(jobs)
+        try:
+            async with self.session_provider() as session:
+                messages = await self.repository.get_messages(
+                    session, [job.message_id for job in jobs]
+                )
+                by_id = {message.id: message for message in messages}
+                missing = [job for job in jobs if job.message_id not in by_id]
+                if missing:
+                    await self.repository.bulk_update_embedding_jobs(
+                        session, [(job.id, "failed", "message_missing") for job in missing]
+                    )
+                    await session.commit()
+            unsubmitted = [job for job in jobs if job.message_id in by_id]
+            while unsubmitted:
+                job = unsubmitted[0]
+                await self.pipeline.submit(job.id, by_id[job.message_id])
+                unsubmitted.pop(0)
+        except asyncio.CancelledError:
+            # Shutdown interrupted the hand-off; put claimed jobs back for the next worker.
+            await self._release_jobs(unsubmitted)
+            raise
+        return len(jobs)
+
+    async def _process_batch(self, jobs: Sequence[EmbeddingJob]) -> int:
+        """Embed a claimed batch and persist every result in a single transaction."""
+        if not jobs:
+            return 0
+        try:
+            async with self.session_provider() as session:
+                messages = await self.repository.get_messages(
+                    session, [job.message_id for job in jobs]
+                )
+                by_id = {message.id: message for message in messages}
+                present = [job for job in jobs if job.message_id in by_id]
+                results = await asyncio.gather(
+                    *(self._guarded_embed(by_id[job.message_id]) for job in present),
+                    return_exceptions=True,
+                )
+
+                message_rows = []
+                job_rows = [
+                    (job.id, "failed", "message_missing")
+                    for job in jobs
+                    if job.message_id not in by_id
+                ]
+                for job, result in zip(present, results):
+                    if isinstance(result, Exception):
+                        logger.error("embedding_job_failed", job_id=str(job.id), error=str(result))
+                        job_rows.append((job.id, "failed", str(result)))
+                        continue
+                    embedding, importance, status, error = result
+                    message_rows.append((job.message_id, embedding, importance, status))
+                    job_rows.append((job.id, status, error))
+
+                await self.repository.bulk_update_message_embeddings(
+                    session, message_rows, normalized=True
+                )
+                await self.repository.bulk_update_embedding_jobs(session, job_rows)
+                await session.commit()
+        except Exception as exc:
+            logger.exception("embedding_batch_failed", jobs=len(jobs), error=str(exc))
+            await self._fail_jobs(jobs, str(exc))
+            return len(jobs)
+
+        index = self.service.vector_index
+        if index is not None:
+            for message_id, embedding, _, status in message_rows:
+                if embedding is not None and status == "completed":
+                    message = by_id[message_id]
+                    index.add(message.tenant_id, message.id, message.conversation_id, embedding)
+        scopes = {(message.tenant_id, message.conversation_id) for message in messages}
+        for tenant_id, conversation_id in scopes:
+            await self.service.cache.schedule_invalidate(tenant_id, conversation_id)
+        return len(jobs)
+
+    async def _guarded_embed(self, message: Message):
+        async with self._sem:
+            return await self.service._compute_embedding(
+                message=message,
+                content=message.content,
+                explicit_importance=message.importance_score,
+            )
+
+    async def _fail_jobs(self, jobs: Sequence[EmbeddingJob], error: str) -> None:
         async with self.session_provider() as session:
+            await self.repository.bulk_update_embedding_jobs(
+                session, [(job.id, "failed", error) for job in jobs]
+            )
+            await session.commit()
+
+    async def _release_jobs(self, jobs: Sequence[EmbeddingJob]) -> None:
+        if not jobs:
+            return
+        try:
+            async with self.session_provider() as session:
+                await self.repository.release_embedding_jobs(session, [job.id for job in jobs])
+                await session.commit()
+        except Exception:
+            logger.exception("embedding_job_release_failed", jobs=len(jobs))
+
+    async def _claim_jobs(self) -> Sequence[EmbeddingJob]:
+        # Serialize claims so the feeder and a direct drain never race for the same rows.
+        async with self._claim_lock, self.session_provider() as session:
             jobs = await self.repository.claim_embedding_jobs(
                 session,
                 limit=self.batch_size,
@@ -105,33 +226,3 @@ class EmbeddingJobQueue:
             )
             await session.commit()
             return jobs
-
-    async def _process_job(self, job_id: UUID) -> None:
-        async with self.session_provider() as session:
-            job = await self.repository.get_embedding_job(session, job_id)
-            if job is None:
-                return
-            message = await self.repository.get_message(session, job.message_id)
-            if message is None:
-                await self.repository.update_embedding_job(
-                    session, job_id=job.id, status="failed", error="message_missing"
-                )
-                await session.commit()
-                return
-            try:
-                await self.service._apply_embedding(
-                    session,
-                    message=message,
-                    content=message.content,
-                    explicit_importance=message.importance_score,
-                )
-                await session.commit()
-            except Exception as exc:  # pragma: no cover - unexpected failures
-                logger.exception("embedding_job_failed", job_id=str(job.id), error=str(exc))
-                await self.repository.update_embedding_job(
-                    session,
-                    job_id=job.id,
-                    status="failed",
-                    error=str(exc),
-                )
-                await session.commit()
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Optional
-from uuid import UUID
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional, Sequence
+from uuid import UUID, uuid4
 
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ai_memory_layer.config import Settings, get_settings
@@ -20,15 +24,62 @@ from ai_memory_layer.models.memory import Message
 from ai_memory_layer.repositories.memory_repository import MemoryRepository
 from ai_memory_layer.schemas.messages import MessageCreate, MessageResponse
 from ai_memory_layer.schemas.memory import MemorySearchParams, MemorySearchResponse, MemorySearchResult
-from ai_memory_layer.services.cache import CacheService
-from ai_memory_layer.services.embedding import EmbeddingService, build_embedding_service
+from ai_memory_layer.services.cache import (
+    CacheService,
+    decode_cached_embedding,
+    encode_embedding,
+)
+from ai_memory_layer.services.embedding import (
+    CircuitBreakerEmbeddingService,
+    EmbeddingBatcher,
+    EmbeddingService,
+    build_embedding_service,
+)
 from ai_memory_layer.services.importance import ImportanceScorer
-from ai_memory_layer.services.retrieval import MemoryRetriever, default_retriever
+from ai_memory_layer.services.retrieval import (
+    MemoryRetriever,
+    default_retriever,
+    normalize_embedding,
+)
+from ai_memory_layer.services.vector_index import VectorIndex, get_vector_index
 
 logger = get_logger(component="message_service")
 
+_UNFETCHED = object()
+
+
+def _message_to_response(message: Message) -> MessageResponse:
+    """Build a response from an ORM row without re-validating columns the DB already typed."""
+    return MessageResponse.model_construct(
+        id=message.id,
+        tenant_id=message.tenant_id,
+        conversation_id=message.conversation_id,
+        role=message.role,
+        content=message.content,
+        metadata=message.message_metadata,
+        importance_score=message.importance_score,
+        embedding_status=message.embedding_status,
+        created_at=message.created_at,
+        updated_at=message.updated_at,
+    )
+
 
-@dataclass
+def _cached_search_response(payload: dict[str, Any]) -> MemorySearchResponse:
+    """Rebuild a response this service cached, restoring only the non-JSON field types."""
+    items = [
+        MemorySearchResult.model_construct(
+            **{
+                **item,
+                "message_id": UUID(item["message_id"]),
+                "created_at": datetime.fromisoformat(item["created_at"]),
+            }
+        )
+        for item in payload["items"]
+    ]
+    return MemorySearchResponse.model_construct(total=payload["total"], items=items)
+
+
+@dataclass(slots=True)
 class MessageService:
     repository: MemoryRepository = field(default_factory=MemoryRepository)
     embedder: EmbeddingService = field(default_factory=build_embedding_service)
@@ -36,43 +87,102 @@ class MessageService:
     retriever: MemoryRetriever = field(default_factory=default_retriever)
     cache: CacheService = field(default_factory=CacheService)
     settings: Settings = field(default_factory=get_settings)
+    batcher: EmbeddingBatcher | None = None
+    vector_index: VectorIndex | None = field(default_factory=get_vector_index)
+    _query_lru: OrderedDict[str, list[float]] = field(default_factory=OrderedDict, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.batcher is None:
+            embedder = self.embedder
+            if isinstance(embedder, CircuitBreakerEmbeddingService):
+                # Stored vectors must come from the real provider; a failed message gets an
+                # embedding job to retry it rather than "completed" mock data.
+                embedder = embedder.without_fallback()
+            self.batcher = EmbeddingBatcher(embedder)
 
     async def ingest(
         self, session: AsyncSession, payload: MessageCreate
     ) -> MessageResponse:
-        message = await self.repository.create_message(
-            session,
-            tenant_id=payload.tenant_id,
-            conversation_id=payload.conversation_id,
-            role=payload.role,
-            content=payload.content,
-            metadata=payload.metadata or {},
-        )
-        if self.settings.async_embeddings:
-            await self.repository.enqueue_embedding_job(session, message.id)
-            await session.commit()
-            record_message_ingested(
-                tenant_id=payload.tenant_id,
-                role=payload.role,
-                async_mode=True,
-                status="queued",
+        """Ingest one message: embedded first, then written by a single INSERT ... RETURNING."""
+        (response,) = await self.ingest_many(session, [payload])
+        return response
+
+    async def ingest_many(
+        self, session: AsyncSession, payloads: Sequence[MessageCreate]
+    ) -> list[MessageResponse]:
+        """Ingest a batch with one multi-row INSERT instead of an insert and update per message.
+
+        Inline embeddings are requested together so the batcher can coalesce them into
+        ``embed_many`` calls; in async mode one job row is queued per message, and inline
+        mode queues one for each message whose embedding failed.
+        """
+        if not payloads:
+            return []
+        async_mode = self.settings.async_embeddings
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": uuid4(),
+                "tenant_id": payload.tenant_id,
+                "conversation_id": payload.conversation_id,
+                "role": payload.role,
+                "content": payload.content,
+                "message_metadata": payload.metadata or {},
+                # Async jobs treat a stored score as the explicit override.
+                "importance_score": payload.importance_override,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for payload in payloads
+        ]
+        if not async_mode:
+            importance = self._importance_batch(
+                created_at=[now] * len(payloads),
+                roles=[payload.role for payload in payloads],
+                overrides=[payload.importance_override for payload in payloads],
+            )
+            embeddings, statuses = await self._embed_contents(
+                [payload.content for payload in payloads]
             )
-            return MessageResponse.model_validate(message)
+            for row, score, embedding, status in zip(rows, importance, embeddings, statuses):
+                row["importance_score"] = score
+                row["embedding"] = embedding
+                row["embedding_normalized"] = embedding is not None
+                # A failed embedding is handed to the job queue, so the row is pending again.
+                row["embedding_status"] = "pending" if status == "failed" else status
 
-        message = await self._apply_embedding(
+        messages = await self.repository.create_messages(session, rows)
+        await self.repository.enqueue_embedding_jobs(
             session,
-            message=message,
-            content=payload.content,
-            explicit_importance=payload.importance_override,
+            [message.id for message in messages if message.embedding_status == "pending"],
         )
         await session.commit()
-        record_message_ingested(
-            tenant_id=payload.tenant_id,
-            role=payload.role,
-            async_mode=False,
-            status=getattr(message, "embedding_status", "completed"),
-        )
-        return MessageResponse.model_validate(message)
+        # Only publish rows other readers can see; a failed commit leaves index and cache alone.
+        if not async_mode:
+            if self.vector_index is not None:
+                for message, embedding in zip(messages, embeddings):
+                    if embedding is not None:
+                        self.vector_index.add(
+                            message.tenant_id,
+                            message.id,
+                            message.conversation_id,
+                            embedding,
+                            message.updated_at,
+                        )
+            for tenant_id, conversation_id in {
+                (message.tenant_id, message.conversation_id) for message in messages
+            }:
+                await self.cache.schedule_invalidate(tenant_id, conversation_id)
+            # The caller may search right after this returns, so clear now (read-your-writes).
+            await self.cache.flush_invalidations()
+        for message in messages:
+            record_message_ingested(
+                tenant_id=message.tenant_id,
+                role=message.role,
+                async_mode=async_mode,
+                status="queued" if async_mode else message.embedding_status,
+            )
+        return [_message_to_response(message) for message in messages]
 
     async def retrieve(
         self,
@@ -82,6 +192,9 @@ class MessageService:
         start = time.perf_counter()
         cache_hit = False
         cache_key = None
+        query_embedding = params.query_embedding
+        # Cache writes are deferred and flushed together once the response is built.
+        pending: list[tuple[str, Any, float]] = []
         if self.cache.enabled:
             cache_key = self.cache.search_key(
                 tenant_id=params.tenant_id,
@@ -89,11 +202,16 @@ class MessageService:
                 query=params.query,
                 top_k=params.top_k,
                 candidate_limit=params.candidate_limit,
+                query_embedding=params.query_embedding,
             )
-            cached = await self.cache.get(cache_key)
+            keys = [cache_key]
+            if query_embedding is None and params.query not in self._query_lru:
+                # Fetch the query embedding alongside the search entry in one round trip.
+                keys.append(self.cache.query_embedding_key(params.query))
+            cached, *prefetched = await self.cache.get_many(keys)
             if cached:
                 cache_hit = True
-                response = MemorySearchResponse.model_validate(cached)
+                response = _cached_search_response(cached)
                 record_memory_search(
                     tenant_id=params.tenant_id,
                     result_count=len(response.items),
@@ -101,31 +219,46 @@ class MessageService:
                     duration=time.perf_counter() - start,
                 )
                 return response
+            if prefetched:
+                query_embedding = await self._embed_query(
+                    params.query, prefetched=prefetched[0], pending=pending
+                )
 
-        query_embedding = await self._embed_text(params.query)
+        if query_embedding is None:
+            query_embedding = await self._embed_query(params.query)
         candidate_limit = min(params.candidate_limit, self.settings.max_results * 10)
         top_k = min(params.top_k, self.settings.max_results)
-        candidates = await self.repository.search_similar_messages(
-            session,
-            tenant_id=params.tenant_id,
-            conversation_id=params.conversation_id,
-            importance_min=params.importance_min,
-            limit=candidate_limit,
-            query_embedding=query_embedding,
+        candidates = await self._index_candidates(
+            session, params, query_embedding=query_embedding, limit=candidate_limit
         )
         if candidates is None:
-            candidates = await self.repository.list_active_messages(
+            candidates = await self.repository.search_similar_messages(
                 session,
                 tenant_id=params.tenant_id,
                 conversation_id=params.conversation_id,
                 importance_min=params.importance_min,
                 limit=candidate_limit,
+                query_embedding=query_embedding,
+            )
+        if candidates is None:
+            # Score the recency-ordered fallback in chunks instead of materializing it all.
+            ranked = await self.retriever.rank_stream(
+                query_embedding=query_embedding,
+                batches=self.repository.stream_active_messages(
+                    session,
+                    tenant_id=params.tenant_id,
+                    conversation_id=params.conversation_id,
+                    importance_min=params.importance_min,
+                    limit=candidate_limit,
+                ),
+                top_k=top_k,
+            )
+        else:
+            ranked = self.retriever.rank(
+                query_embedding=query_embedding,
+                candidates=candidates,
+                top_k=top_k,
             )
-        ranked = self.retriever.rank(
-            query_embedding=query_embedding,
-            candidates=candidates,
-            top_k=top_k,
-        )
         results = [
             MemorySearchResult(
                 message_id=item.message.id,
@@ -145,7 +278,8 @@ class MessageService:
             items=results,
         )
         if cache_key:
-            await self.cache.set(cache_key, response.model_dump(mode='json'))
+            pending.append((cache_key, response.model_dump(mode='json'), self.cache.search_ttl))
+            await self.cache.set_many(pending)
         record_memory_search(
             tenant_id=params.tenant_id,
             result_count=len(results),
@@ -154,33 +288,127 @@ class MessageService:
         )
         return response
 
+    async def _index_candidates(
+        self,
+        session: AsyncSession,
+        params: MemorySearchParams,
+        *,
+        query_embedding: list[float],
+        limit: int,
+    ) -> list[Message] | None:
+        """Hydrate the vector index's nearest neighbours, or None when there is no index."""
+        if self.vector_index is None:
+            return None
+        if not self.vector_index.is_built(params.tenant_id):
+            rows = await self.repository.list_tenant_embeddings(session, params.tenant_id)
+            self.vector_index.build(params.tenant_id, rows)
+        else:
+            await self._refresh_index(session, params.tenant_id)
+        ids = self.vector_index.search(
+            params.tenant_id,
+            query_embedding,
+            conversation_id=params.conversation_id,
+            limit=limit,
+        )
+        if ids is None:
+            return None
+        messages = await self.repository.get_messages(session, ids)
+        # The index is not told about archival or status changes, so recheck the row.
+        return [
+            message
+            for message in messages
+            if not message.archived
+            and message.embedding_status == "completed"
+            and (
+                params.importance_min is None
+                or (message.importance_score or 0.0) >= params.importance_min
+            )
+        ]
+
+    async def _refresh_index(self, session: AsyncSession, tenant_id: str) -> None:
+        """Add embeddings other processes wrote since the index last looked.
+
+        ``updated_at`` is stamped before commit, so rows are rescanned over a lookback
+        window and only versions the index has not recorded are loaded.
+        """
+        watermark = self.vector_index.watermark(tenant_id)
+        since = None
+        if watermark is not None:
+            since = watermark - timedelta(
+                seconds=self.settings.vector_index_refresh_lookback_seconds
+            )
+        versions = await self.repository.list_embedding_versions(
+            session, tenant_id, updated_since=since
+        )
+        changed = self.vector_index.changed(tenant_id, versions)
+        if not changed:
+            return
+        rows = await self.repository.list_tenant_embeddings(
+            session, tenant_id, message_ids=changed
+        )
+        for message_id, conversation_id, embedding, updated_at in rows:
+            self.vector_index.add(tenant_id, message_id, conversation_id, embedding, updated_at)
+
     async def fetch(self, session: AsyncSession, message_id: UUID) -> MessageResponse | None:
         message = await self.repository.get_message(session, message_id)
         if message is None:
             return None
-        return MessageResponse.model_validate(message)
+        return _message_to_response(message)
 
-    async def _apply_embedding(
+    async def _compute_embedding(
         self,
-        session: AsyncSession,
         *,
         message: Message,
         content: str,
         explicit_importance: Optional[float],
-    ):
-        base_importance = explicit_importance
-        if base_importance is None:
-            base_importance = self.scorer.score(
+    ) -> tuple[list[float] | None, float, str, str | None]:
+        """Score and embed a message without writing; returns (embedding, importance, status, error).
+
+        Successful embeddings are L2-normalized.
+        """
+        base_importance = self._base_importance(
+            message=message, explicit_importance=explicit_importance
+        )
+        embedding, status, error = await self._embed_content(message=message, content=content)
+        return embedding, base_importance, status, error
+
+    def _base_importance(self, *, message: Message, explicit_importance: Optional[float]) -> float:
+        if explicit_importance is None:
+            return self.scorer.score(
                 created_at=message.created_at,
                 role=message.role,
                 explicit_importance=None,
             )
-        else:
-            base_importance = max(0.0, min(base_importance, 1.0))
+        return max(0.0, min(explicit_importance, 1.0))
+
+    def _base_importance_batch(self, messages: Sequence[Message]) -> list[float]:
+        """``_base_importance`` for many messages, using each row's stored override."""
+        return self._importance_batch(
+            created_at=[message.created_at for message in messages],
+            roles=[message.role for message in messages],
+            overrides=[message.importance_score for message in messages],
+        )
+
+    def _importance_batch(
+        self,
+        *,
+        created_at: Sequence[datetime],
+        roles: Sequence[str],
+        overrides: Sequence[float | None],
+    ) -> list[float]:
+        explicit = np.array(
+            [np.nan if value is None else value for value in overrides], dtype=np.float64
+        )
+        scored = self.scorer.score_batch(created_at=created_at, roles=roles)
+        return np.where(np.isnan(explicit), scored, np.clip(explicit, 0.0, 1.0)).tolist()
 
+    async def _embed_content(
+        self, *, message: Message, content: str
+    ) -> tuple[list[float] | None, str, str | None]:
         start = time.perf_counter()
         try:
-            embedding = await self._embed_text(content)
+            # Store unit-length vectors so ranking is a plain dot product.
+            embedding = normalize_embedding(await self._embed_text(content))
             status = "completed"
             error = None
         except Exception as exc:
@@ -188,30 +416,143 @@ class MessageService:
             embedding = None
             status = "failed"
             error = str(exc)
-
-        updated = await self.repository.update_message_embedding(
-            session,
-            message.id,
-            embedding=embedding,
-            importance_score=base_importance,
-            status=status,
-        )
         record_embedding_job(status=status, duration=time.perf_counter() - start)
-        if self.settings.async_embeddings:
-            await self.repository.update_embedding_job(
-                session, message.id, status=status, error=error
+        return embedding, status, error
+
+    async def _embed_contents(
+        self, contents: Sequence[str]
+    ) -> tuple[list[list[float] | None], list[str]]:
+        """Embed and L2-normalize many texts as one matrix; returns (embeddings, statuses).
+
+        A text whose embedding failed gets ``None`` and "failed" without failing the others.
+        """
+        start = time.perf_counter()
+        embeddings: list[list[float] | None] = [None] * len(contents)
+        statuses = ["failed"] * len(contents)
+        results = await self._embed_texts(contents)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        done = [index for index, result in enumerate(results) if not isinstance(result, BaseException)]
+        if done:
+            try:
+                matrix = np.asarray([results[index] for index in done], dtype=np.float32)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                for index, row in zip(done, (matrix / norms).tolist()):
+                    embeddings[index] = row
+                    statuses[index] = "completed"
+            except Exception as exc:
+                errors.append(exc)
+        if errors:
+            logger.error(
+                "embedding_failed",
+                batch=len(contents),
+                failed=statuses.count("failed"),
+                error=str(errors[0]),
+            )
+        duration = (time.perf_counter() - start) / len(contents)
+        for status in statuses:
+            record_embedding_job(status=status, duration=duration)
+        return embeddings, statuses
+
+    async def _embed_texts(
+        self, texts: Sequence[str]
+    ) -> list[list[float] | BaseException]:
+        """Batch ``_embed_text``: one cache read and write for all texts, misses embedded together.
+
+        Failures come back in place as exceptions; only successful embeddings are cached.
+        """
+        if not self.cache.enabled:
+            return list(
+                await asyncio.gather(
+                    *(self.batcher.embed(text) for text in texts), return_exceptions=True
+                )
+            )
+        keys = [self.cache.embedding_key(text) for text in texts]
+        found: list[Any] = [
+            decode_cached_embedding(raw) for raw in await self.cache.get_many(keys)
+        ]
+        missing = [index for index, embedding in enumerate(found) if embedding is None]
+        if missing:
+            fresh = await asyncio.gather(
+                *(self.batcher.embed(texts[index]) for index in missing), return_exceptions=True
+            )
+            for index, embedding in zip(missing, fresh):
+                found[index] = embedding
+            await self.cache.set_many(
+                [
+                    (keys[index], encode_embedding(embedding), self.cache.embedding_ttl)
+                    for index, embedding in zip(missing, fresh)
+                    if not isinstance(embedding, BaseException)
+                ]
             )
-        await self.cache.invalidate_search(message.tenant_id, message.conversation_id)
-        return updated or message
+        return found
 
     async def _embed_text(self, text: str) -> list[float]:
         cache_key = None
         if self.cache.enabled:
             cache_key = self.cache.embedding_key(text)
-            cached = await self.cache.get(cache_key)
+            cached = await self.cache.get_embedding(cache_key)
             if cached is not None:
                 return cached
-        embedding = await self.embedder.embed(text)
+        embedding = await self.batcher.embed(text)
         if cache_key:
-            await self.cache.set(cache_key, embedding, ttl=self.cache.embedding_ttl)
+            await self.cache.set_embedding(cache_key, embedding, ttl=self.cache.embedding_ttl)
         return embedding
+
+    async def _embed_query(
+        self,
+        text: str,
+        *,
+        prefetched: Any = _UNFETCHED,
+        pending: list[tuple[str, Any, float]] | None = None,
+    ) -> list[float]:
+        """Embed a search query, checking an in-process LRU before the shared cache.
+
+        The LRU is used whenever ``query_embedding_lru_size`` is positive, even with the
+        shared cache disabled. ``prefetched`` is the raw shared-cache entry when the caller
+        already read it, and ``pending`` collects the cache write instead of issuing it
+        immediately.
+        """
+        lru_size = self.settings.query_embedding_lru_size
+        if lru_size > 0:
+            local = self._query_lru.get(text)
+            if local is not None:
+                self._query_lru.move_to_end(text)
+                return local
+        embedding = None
+        cache_key = None
+        if self.cache.enabled:
+            cache_key = self.cache.query_embedding_key(text)
+            if prefetched is _UNFETCHED:
+                embedding = await self.cache.get_embedding(cache_key)
+            else:
+                embedding = decode_cached_embedding(prefetched)
+        if embedding is None:
+            embedding, cacheable = await self._embed_query_text(text)
+            if not cacheable:
+                return embedding
+            if cache_key is not None:
+                entry = (cache_key, encode_embedding(embedding), self.cache.query_embedding_ttl)
+                if pending is None:
+                    await self.cache.set_many([entry])
+                else:
+                    pending.append(entry)
+        if lru_size > 0:
+            self._query_lru[text] = embedding
+            if len(self._query_lru) > lru_size:
+                self._query_lru.popitem(last=False)
+        return embedding
+
+    async def _embed_query_text(self, text: str) -> tuple[list[float], bool]:
+        """Embed a query; returns (embedding, cacheable).
+
+        Searches stay available on the provider's fallback while it is down, but those
+        vectors are never cached.
+        """
+        try:
+            return await self.batcher.embed(text), True
+        except Exception:
+            if not isinstance(self.embedder, CircuitBreakerEmbeddingService):
+                raise
+            logger.warning("query_embedding_fallback")
+            return await self.embedder.fallback.embed(text), False
@@ -20,57 +20,91 @@ class MonitoringService:
     def __init__(self):
         self.settings = get_settings()
         self.alert_handlers: list[callable] = []
+        self._redis = None
+        if self.settings.redis_url:
+            import redis.asyncio as redis
+
+            # One small pool for the service's lifetime so probes reuse an open connection.
+            self._redis = redis.from_url(
+                self.settings.redis_url,
+                max_connections=4,
+                socket_timeout=self.settings.health_redis_timeout_seconds,
+            )
 
     def register_alert_handler(self, handler: callable) -> None:
         """Register an alert handler function."""
         self.alert_handlers.append(handler)
 
     async def check_health(self) -> dict[str, Any]:
-        """Perform comprehensive health check."""
+        """Perform comprehensive health check; probes run concurrently with their own timeouts."""
         health_status = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "status": "healthy",
             "checks": {},
         }
 
-        # Database health
-        db_healthy, db_latency = await check_database_health()
-        health_status["checks"]["database"] = {
-            "healthy": db_healthy,
-            "latency_ms": db_latency * 1000 if db_latency else None,
+        probes = {
+            "database": (self._check_db(), self.settings.healthcheck_timeout_seconds),
+            "metrics": (self._check_metrics(), self.settings.health_metrics_timeout_seconds),
         }
-
-        if not db_healthy:
+        if self._redis is not None:
+            probes["redis"] = (self._check_redis(), self.settings.health_redis_timeout_seconds)
+        results = await asyncio.gather(
+            *(asyncio.wait_for(probe, timeout) for probe, timeout in probes.values()),
+            return_exceptions=True,
+        )
+        checks = dict(zip(probes, results))
+
+        db_result = checks["database"]
+        if isinstance(db_result, BaseException):
+            db_result = {"healthy": False, "latency_ms": None, "error": _describe(db_result)}
+        health_status["checks"]["database"] = db_result
+        if not db_result["healthy"]:
             health_status["status"] = "unhealthy"
             await self._trigger_alert("database_unhealthy", "Database health check failed")
 
-        # Redis health (if configured)
-        if self.settings.redis_url:
-            try:
-                import redis.asyncio as redis
-
-                client = redis.from_url(self.settings.redis_url)
-                await client.ping()
-                await client.close()
-                health_status["checks"]["redis"] = {"healthy": True}
-            except Exception as e:
-                health_status["checks"]["redis"] = {"healthy": False, "error": str(e)}
+        if "redis" in checks:
+            redis_result = checks["redis"]
+            if isinstance(redis_result, BaseException):
+                error = _describe(redis_result)
+                health_status["checks"]["redis"] = {"healthy": False, "error": error}
                 health_status["status"] = "unhealthy"
-                await self._trigger_alert("redis_unhealthy", f"Redis health check failed: {e}")
-
-        # Metrics summary
-        try:
-            metrics = get_metrics()
-            health_status["checks"]["metrics"] = {
-                "healthy": True,
-                "request_count": metrics.get("http_requests_total", 0),
-                "error_rate": metrics.get("error_rate", 0.0),
-            }
-        except Exception as e:
-            health_status["checks"]["metrics"] = {"healthy": False, "error": str(e)}
+                await self._trigger_alert("redis_unhealthy", f"Redis health check failed: {error}")
+            else:
+                health_status["checks"]["redis"] = redis_result
+
+        metrics_result = checks["metrics"]
+        if isinstance(metrics_result, BaseException):
+            metrics_result = {"healthy": False, "error": _describe(metrics_result)}
+        health_status["checks"]["metrics"] = metrics_result
 
         return health_status
 
+    async def _check_db(self) -> dict[str, Any]:
+        db_healthy, db_latency = await check_database_health()
+        return {
+            "healthy": db_healthy,
+            "latency_ms": db_latency * 1000 if db_latency else None,
+        }
+
+    async def _check_redis(self) -> dict[str, Any]:
+        await self._redis.ping()
+        return {"healthy": True}
+
+    async def aclose(self) -> None:
+        """Release the pooled Redis connections."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _check_metrics(self) -> dict[str, Any]:
+        metrics = get_metrics()
+        return {
+            "healthy": True,
+            "request_count": metrics.get("http_requests_total", 0),
+            "error_rate": metrics.get("error_rate", 0.0),
+        }
+
     async def _trigger_alert(self, alert_type: str, message: str, severity: str = "warning") -> None:
         """Trigger an alert to all registered handlers."""
         alert = {
@@ -107,6 +141,12 @@ class MonitoringService:
         }
 
 
+def _describe(exc: BaseException) -> str:
+    if isinstance(exc, asyncio.TimeoutError):
+        return "timeout"
+    return str(exc)
+
+
 # Global monitoring service instance
 _monitoring_service: MonitoringService | None = None
 
@@ -118,3 +158,10 @@ def get_monitoring_service() -> MonitoringService:
         _monitoring_service = MonitoringService()
     return _monitoring_service
 
+
+async def close_monitoring_service() -> None:
+    """Close the global monitoring service, if one was created."""
+    global _monitoring_service
+    if _monitoring_service is not None:
+        await _monitoring_service.aclose()
+        _monitoring_service = None
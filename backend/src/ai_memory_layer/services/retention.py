@@ -7,7 +7,9 @@ from dataclasses import dataclass
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ai_memory_layer.config import get_settings
+from ai_memory_layer.models.memory import RetentionPolicy
 from ai_memory_layer.repositories.memory_repository import MemoryRepository
+from ai_memory_layer.services.vector_index import get_vector_index
 
 
 @dataclass
@@ -33,7 +35,15 @@ class RetentionService:
         actions = actions or {"archive", "delete"}
         settings = get_settings()
         policy = await self.repository.load_policy(session, tenant_id)
-        if policy is None:
+        if policy is None and dry_run:
+            # Preview with the defaults a real run would store, without writing them.
+            policy = RetentionPolicy(
+                tenant_id=tenant_id,
+                max_age_days=settings.retention_max_age_days,
+                importance_threshold=settings.retention_importance_threshold,
+                delete_after_days=settings.retention_delete_after_days,
+            )
+        elif policy is None:
             policy = await self.repository.upsert_retention_policy(
                 session,
                 tenant_id=tenant_id,
@@ -43,27 +53,43 @@ class RetentionService:
                 delete_after_days=settings.retention_delete_after_days,
             )
 
-        candidates = await self.repository.archive_candidates(
-            session,
-            tenant_id=tenant_id,
-            older_than_days=policy.max_age_days,
-            importance_threshold=policy.importance_threshold,
-        )
+        if dry_run:
+            # Report what a real run would touch with COUNT queries alone.
+            archived = 0
+            deleted = 0
+            if "archive" in actions:
+                archived = await self.repository.count_archivable(
+                    session,
+                    tenant_id=tenant_id,
+                    older_than_days=policy.max_age_days,
+                    importance_threshold=policy.importance_threshold,
+                )
+            if "delete" in actions:
+                deleted = await self.repository.count_deletable(
+                    session,
+                    older_than_days=policy.delete_after_days,
+                    tenant_id=tenant_id,
+                )
+            return RetentionResult(archived=archived, deleted=deleted)
 
         archived = 0
         deleted = 0
-        if not dry_run and candidates and "archive" in actions:
-            archived = await self.repository.move_to_archive(
-                session, messages=candidates, reason="policy"
+        if "archive" in actions:
+            archived = await self.repository.archive_matching(
+                session,
+                tenant_id=tenant_id,
+                older_than_days=policy.max_age_days,
+                importance_threshold=policy.importance_threshold,
+                reason="policy",
             )
-        if not dry_run and "delete" in actions:
+        if "delete" in actions:
             deleted = await self.repository.delete_archived(
                 session,
                 older_than_days=policy.delete_after_days,
                 tenant_id=tenant_id,
             )
         await session.commit()
-        return RetentionResult(
-            archived=archived if (not dry_run and "archive" in actions) else 0,
-            deleted=deleted if (not dry_run and "delete" in actions) else 0,
-        )
+        index = get_vector_index()
+        if archived and index is not None:
+            index.invalidate(tenant_id)
+        return RetentionResult(archived=archived, deleted=deleted)
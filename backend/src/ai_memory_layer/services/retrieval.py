@@ -2,13 +2,24 @@
 
 from __future__ import annotations
 
+import heapq
 import math
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable, Sequence
+from typing import AsyncIterable, Callable, Iterable, Sequence
+
+import numpy as np
 
 from ai_memory_layer.config import get_settings
 from ai_memory_layer.models.memory import Message
+from ai_memory_layer.services._retrieval_kernels import (
+    JIT_MIN_CANDIDATES,
+    score_candidates,
+    top_k_indices,
+)
+
+DECAY_SECONDS = 604800.0  # 1-week half-life
+_EPSILON = 1e-12
 
 
 def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
@@ -22,6 +33,15 @@ def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
     return dot / (norm_a * norm_b)
 
 
+def normalize_embedding(embedding: Sequence[float]) -> list[float]:
+    """Scale an embedding to unit L2 length; zero vectors are returned unchanged."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector /= norm
+    return vector.tolist()
+
+
 @dataclass
 class RetrievedMemory:
     message: Message
@@ -30,6 +50,69 @@ class RetrievedMemory:
     decay: float
 
 
+def _stack_embeddings(
+    candidates: Iterable[Message],
+    dimensions: int,
+    allocate: Callable[[int, int], np.ndarray] | None = None,
+) -> tuple[list[Message], np.ndarray, np.ndarray, np.ndarray]:
+    """Collect embedded candidates and stack matching-width vectors into an (N, D) matrix.
+
+    Returns the messages, the float32 matrix of usable rows, the row indices those vectors
+    belong to, and a mask of matrix rows that were not stored pre-normalized. Candidates
+    with a mismatched width keep a similarity of zero. ``allocate(rows, dimensions)`` may
+    supply a reusable buffer for the matrix.
+    """
+    messages = [message for message in candidates if message.embedding is not None]
+    # Copy each vector straight into a preallocated matrix; no intermediate lists.
+    if allocate is None:
+        matrix = np.empty((len(messages), dimensions), dtype=np.float32)
+    else:
+        matrix = allocate(len(messages), dimensions)
+    rows: list[int] = []
+    raw: list[bool] = []
+    for index, message in enumerate(messages):
+        embedding = message.embedding
+        if len(embedding) == dimensions:
+            matrix[len(rows)] = embedding
+            rows.append(index)
+            raw.append(not getattr(message, "embedding_normalized", False))
+    return (
+        messages,
+        matrix[: len(rows)],
+        np.asarray(rows, dtype=np.intp),
+        np.asarray(raw, dtype=bool),
+    )
+
+
+def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the ``top_k`` highest scores, best first, ties broken by position."""
+    k = min(top_k, scores.size)
+    if top_k_indices is not None and scores.size > JIT_MIN_CANDIDATES:
+        return top_k_indices(scores, k)
+    if k < scores.size:
+        # Partition first so only the top_k winners are sorted. argpartition picks an
+        # arbitrary subset of values tied at the cut, so take the earliest ones explicitly.
+        cut = np.partition(scores, scores.size - k)[scores.size - k]
+        above = np.flatnonzero(scores > cut)
+        tied = np.flatnonzero(scores == cut)[: k - above.size]
+        top = np.sort(np.concatenate((above, tied)))
+    else:
+        top = np.arange(scores.size)
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def _ages_seconds(messages: Sequence[Message]) -> np.ndarray:
+    """Seconds since each message was created; naive timestamps (SQLite) are taken as UTC."""
+    created = [message.created_at for message in messages]
+    if any(stamp.tzinfo is not None for stamp in created):
+        created = [
+            stamp.astimezone(timezone.utc).replace(tzinfo=None) if stamp.tzinfo else stamp
+            for stamp in created
+        ]
+    now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), "us")
+    return (now - np.array(created, dtype="datetime64[us]")) / np.timedelta64(1, "s")
+
+
 class MemoryRetriever:
     """Combines scoring signals to deterministically rank memories."""
 
@@ -44,6 +127,17 @@ class MemoryRetriever:
         self.similarity_weight = similarity_weight / total
         self.importance_weight = importance_weight / total
         self.decay_weight = decay_weight / total
+        self._weights = (self.similarity_weight, self.importance_weight, self.decay_weight)
+        # Grow-only scratch matrix reused across rank() calls; rank() never awaits, so
+        # requests on the event loop cannot interleave while it is in use.
+        self._scratch = np.empty((0, 0), dtype=np.float32)
+
+    def _scratch_rows(self, rows: int, dimensions: int) -> np.ndarray:
+        scratch = self._scratch
+        if scratch.shape[1] != dimensions or scratch.shape[0] < rows:
+            capacity = max(rows, 2 * scratch.shape[0] if scratch.shape[1] == dimensions else 0)
+            scratch = self._scratch = np.empty((capacity, dimensions), dtype=np.float32)
+        return scratch[:rows]
 
     def rank(
         self,
@@ -52,31 +146,77 @@ class MemoryRetriever:
         candidates: Iterable[Message],
         top_k: int,
     ) -> list[RetrievedMemory]:
-        scored: list[RetrievedMemory] = []
-        now = datetime.now(timezone.utc)
-        for message in candidates:
-            if message.embedding is None:
-                continue
-            embedding = list(message.embedding)
-            similarity = cosine_similarity(query_embedding, embedding)
-            age_seconds = (now - message.created_at.replace(tzinfo=timezone.utc)).total_seconds()
-            decay = math.exp(-age_seconds / (60 * 60 * 24 * 7))  # 1-week half-life
-            importance = message.importance_score or 0.0
-            score = (
-                similarity * self.similarity_weight
-                + importance * self.importance_weight
-                + decay * self.decay_weight
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        messages, matrix, rows, raw = _stack_embeddings(
+            candidates, query.shape[0], self._scratch_rows
+        )
+        if not messages or top_k <= 0:
+            return []
+
+        if rows.size and query.size:
+            query = query / (np.linalg.norm(query) + _EPSILON)
+            if raw.any():
+                # Only legacy rows need normalizing; new writes are stored at unit length.
+                legacy = matrix[raw]
+                matrix[raw] = legacy / (np.linalg.norm(legacy, axis=1, keepdims=True) + _EPSILON)
+
+        ages = _ages_seconds(messages)
+        importance = np.fromiter(
+            (m.importance_score or 0.0 for m in messages),
+            dtype=np.float64,
+            count=len(messages),
+        )
+        if score_candidates is not None and len(messages) > JIT_MIN_CANDIDATES:
+            scores, similarities, decays = score_candidates(
+                matrix,
+                rows,
+                query,
+                importance,
+                ages,
+                *self._weights,
+                DECAY_SECONDS,
+            )
+        else:
+            similarities = np.zeros(len(messages), dtype=np.float64)
+            if rows.size:
+                similarities[rows] = matrix @ query
+            decays = np.exp(-ages / DECAY_SECONDS)
+            similarity_weight, importance_weight, decay_weight = self._weights
+            scores = (
+                similarities * similarity_weight
+                + importance * importance_weight
+                + decays * decay_weight
             )
-            scored.append(
-                RetrievedMemory(
-                    message=message,
-                    score=score,
-                    similarity=similarity,
-                    decay=decay,
-                )
+
+        order = _top_k(scores, top_k)
+        return [
+            RetrievedMemory(
+                message=messages[index],
+                score=float(scores[index]),
+                similarity=float(similarities[index]),
+                decay=float(decays[index]),
             )
-        scored.sort(key=lambda item: item.score, reverse=True)
-        return scored[:top_k]
+            for index in order
+        ]
+
+    async def rank_stream(
+        self,
+        *,
+        query_embedding: Sequence[float],
+        batches: AsyncIterable[Sequence[Message]],
+        top_k: int,
+    ) -> list[RetrievedMemory]:
+        """Rank candidates arriving in chunks, keeping only the running top_k."""
+        best: list[RetrievedMemory] = []
+        async for batch in batches:
+            ranked = self.rank(query_embedding=query_embedding, candidates=batch, top_k=top_k)
+            # nlargest is stable, so earlier chunks win ties exactly as in rank().
+            best = heapq.nlargest(top_k, [*best, *ranked], key=_by_score)
+        return best
+
+
+def _by_score(item: RetrievedMemory) -> float:
+    return item.score
 
 
 def default_retriever() -> MemoryRetriever:
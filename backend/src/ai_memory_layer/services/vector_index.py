@@ -0,0 +1,213 @@
+"""Optional in-process FAISS index for picking retrieval candidates.
+
+Disabled unless ``VECTOR_INDEX_ENABLED`` is set and faiss is importable. Each tenant's
+index is built lazily from the database on its first search; until then callers fall
+back to the repository queries. Every row's ``updated_at`` is recorded so searches can
+pick up embeddings written by other processes (workers, replicas) since the last look.
+
+With ``VECTOR_INDEX_HNSW_M`` above zero the exact flat index is swapped for an HNSW
+graph, trading a little recall for sub-linear search on large tenants; retrieval still
+re-ranks the shortlist with importance and decay.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Iterable, Sequence
+from uuid import UUID
+
+import numpy as np
+
+from ai_memory_layer.config import get_settings
+from ai_memory_layer.logging import get_logger
+
+try:  # pragma: no cover - optional dependency
+    import faiss
+except ImportError:  # pragma: no cover
+    faiss = None
+
+logger = get_logger(component="vector_index")
+
+_HNSW_EF_SEARCH = 64
+
+
+@dataclass(slots=True)
+class _TenantIndex:
+    index: Any
+    # Positions whose vector was replaced hold None; HNSW cannot delete, so they stay indexed.
+    message_ids: list[UUID | None] = field(default_factory=list)
+    positions: dict[UUID, int] = field(default_factory=dict)
+    conversations: dict[str, list[int]] = field(default_factory=dict)
+    retired: int = 0
+    versions: dict[UUID, datetime] = field(default_factory=dict)
+    watermark: datetime | None = None
+
+
+class VectorIndex:
+    """Per-tenant inner-product indexes over unit-length message embeddings."""
+
+    def __init__(self, dimensions: int, hnsw_m: int = 0) -> None:
+        if faiss is None:
+            raise RuntimeError("faiss dependency missing; install faiss-cpu")
+        self.dimensions = dimensions
+        self.hnsw_m = hnsw_m
+        self._tenants: dict[str, _TenantIndex] = {}
+
+    def is_built(self, tenant_id: str) -> bool:
+        return tenant_id in self._tenants
+
+    def build(
+        self,
+        tenant_id: str,
+        rows: Iterable[tuple[UUID, str, Sequence[float], datetime | None]],
+    ) -> None:
+        """Replace the tenant's index.
+
+        ``rows`` are (message_id, conversation_id, embedding, updated_at) tuples.
+        """
+        tenant = _TenantIndex(index=self._new_index())
+        self._tenants[tenant_id] = tenant
+        rows = list(rows)
+        for message_id, _, _, updated_at in rows:
+            self._note_version(tenant, message_id, updated_at)
+        rows = [row for row in rows if len(row[2]) == self.dimensions]
+        if not rows:
+            return
+        matrix = _unit_rows(np.asarray([row[2] for row in rows], dtype=np.float32))
+        positions = np.arange(len(rows), dtype=np.int64)
+        for position, (message_id, conversation_id, _, _) in enumerate(rows):
+            self._track(tenant, message_id, conversation_id, position)
+        self._add_rows(tenant, matrix, positions)
+        logger.info("vector_index_built", tenant_id=tenant_id, size=len(rows))
+
+    def add(
+        self,
+        tenant_id: str,
+        message_id: UUID,
+        conversation_id: str,
+        embedding: Sequence[float],
+        updated_at: datetime | None = None,
+    ) -> None:
+        """Add or replace one embedding; a no-op until the tenant's index is built."""
+        tenant = self._tenants.get(tenant_id)
+        if tenant is None:
+            return
+        self._note_version(tenant, message_id, updated_at)
+        if len(embedding) != self.dimensions:
+            return
+        old = tenant.positions.get(message_id)
+        if old is not None:
+            tenant.message_ids[old] = None
+            if self.hnsw_m:
+                tenant.retired += 1
+            else:
+                tenant.index.remove_ids(np.asarray([old], dtype=np.int64))
+        position = len(tenant.message_ids)
+        self._track(tenant, message_id, conversation_id, position)
+        vector = _unit_rows(np.asarray([embedding], dtype=np.float32))
+        self._add_rows(tenant, vector, np.asarray([position], dtype=np.int64))
+
+    def search(
+        self,
+        tenant_id: str,
+        query: Sequence[float],
+        *,
+        conversation_id: str | None,
+        limit: int,
+    ) -> list[UUID] | None:
+        """Ids of the ``limit`` most similar messages, or None if the tenant is not built."""
+        tenant = self._tenants.get(tenant_id)
+        if tenant is None:
+            return None
+        if tenant.index.ntotal == 0 or limit <= 0 or len(query) != self.dimensions:
+            return []
+        selector = None
+        if conversation_id is not None:
+            members = tenant.conversations.get(conversation_id)
+            if not members:
+                return []
+            selector = faiss.IDSelectorBatch(np.asarray(members, dtype=np.int64))
+        # Over-fetch by the number of replaced vectors still in the graph, then drop them.
+        k = min(limit + tenant.retired, tenant.index.ntotal)
+        if self.hnsw_m:
+            params = faiss.SearchParametersHNSW(sel=selector, efSearch=max(k, _HNSW_EF_SEARCH))
+        else:
+            params = faiss.SearchParameters(sel=selector) if selector is not None else None
+        vector = _unit_rows(np.asarray([query], dtype=np.float32))
+        _, ids = tenant.index.search(vector, k, params=params)
+        found = (tenant.message_ids[position] for position in ids[0] if position >= 0)
+        return [message_id for message_id in found if message_id is not None][:limit]
+
+    def watermark(self, tenant_id: str) -> datetime | None:
+        """Newest ``updated_at`` the tenant's index has seen, or None."""
+        tenant = self._tenants.get(tenant_id)
+        return tenant.watermark if tenant is not None else None
+
+    def changed(
+        self, tenant_id: str, versions: Iterable[tuple[UUID, datetime]]
+    ) -> list[UUID]:
+        """Ids from (message_id, updated_at) pairs whose version the index has not seen."""
+        tenant = self._tenants.get(tenant_id)
+        if tenant is None:
+            return []
+        return [
+            message_id
+            for message_id, updated_at in versions
+            if tenant.versions.get(message_id) != updated_at
+        ]
+
+    def invalidate(self, tenant_id: str) -> None:
+        """Drop a tenant's index so the next search rebuilds it from the database."""
+        self._tenants.pop(tenant_id, None)
+
+    def _new_index(self) -> Any:
+        if self.hnsw_m:
+            # Rows are only ever appended, so HNSW's sequential ids already equal positions.
+            return faiss.IndexHNSWFlat(self.dimensions, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        return faiss.IndexIDMap(faiss.IndexFlatIP(self.dimensions))
+
+    def _add_rows(self, tenant: _TenantIndex, matrix: np.ndarray, positions: np.ndarray) -> None:
+        if self.hnsw_m:
+            tenant.index.add(matrix)
+        else:
+            tenant.index.add_with_ids(matrix, positions)
+
+    @staticmethod
+    def _note_version(
+        tenant: _TenantIndex, message_id: UUID, updated_at: datetime | None
+    ) -> None:
+        if updated_at is None:
+            # Unknown version: leave it for the next refresh to pick up from the database.
+            tenant.versions.pop(message_id, None)
+            return
+        tenant.versions[message_id] = updated_at
+        if tenant.watermark is None or updated_at > tenant.watermark:
+            tenant.watermark = updated_at
+
+    @staticmethod
+    def _track(
+        tenant: _TenantIndex, message_id: UUID, conversation_id: str, position: int
+    ) -> None:
+        tenant.message_ids.append(message_id)
+        tenant.positions[message_id] = position
+        tenant.conversations.setdefault(conversation_id, []).append(position)
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms)
+
+
+@lru_cache(maxsize=1)
+def get_vector_index() -> VectorIndex | None:
+    """Process-wide index, or None when disabled or faiss is unavailable."""
+    settings = get_settings()
+    if not settings.vector_index_enabled:
+        return None
+    if faiss is None:
+        logger.warning("vector_index_unavailable", reason="faiss_not_installed")
+        return None
+    return VectorIndex(settings.embedding_dimensions, hnsw_m=settings.vector_index_hnsw_m)
@@ -3,13 +3,88 @@
 from __future__ import annotations
 
 from collections.abc import Mapping, Sequence
-from typing import Any
+from typing import Any, Iterator
 
 
 class MetadataValidationError(ValueError):
     """Raised when metadata payloads are invalid."""
 
 
+_MAPPING, _SEQUENCE, _STRING, _SCALAR = range(4)
+
+# Exact-type dispatch covers JSON-decoded payloads; the ABC checks only run for other types.
+_KINDS: dict[type, int] = {
+    dict: _MAPPING,
+    list: _SEQUENCE,
+    tuple: _SEQUENCE,
+    str: _STRING,
+    int: _SCALAR,
+    float: _SCALAR,
+    bool: _SCALAR,
+    type(None): _SCALAR,
+}
+
+
+def _kind(value: Any) -> int:
+    kind = _KINDS.get(type(value))
+    if kind is not None:
+        return kind
+    if isinstance(value, Mapping):
+        return _MAPPING
+    if isinstance(value, str):
+        return _STRING
+    if isinstance(value, Sequence) and not isinstance(value, (bytes, bytearray)):
+        return _SEQUENCE
+    if isinstance(value, (int, float)):
+        return _SCALAR
+    raise MetadataValidationError(f"unsupported metadata type: {type(value).__name__}")
+
+
+class _Frame:
+    """A container being cleaned; children are collected until it is exhausted."""
+
+    __slots__ = (
+        "source",
+        "depth",
+        "is_mapping",
+        "children",
+        "keys",
+        "values",
+        "changed",
+        "pending_key",
+    )
+
+    def __init__(self, source: Any, depth: int, is_mapping: bool) -> None:
+        self.source = source
+        self.depth = depth
+        self.is_mapping = is_mapping
+        self.children: Iterator[tuple[Any, Any]] = (
+            iter(source.items()) if is_mapping else enumerate(source)
+        )
+        self.keys: list[Any] = []
+        self.values: list[Any] = []
+        # Only plain dicts/lists with str keys can be returned as-is.
+        self.changed = type(source) is not (dict if is_mapping else list)
+        self.pending_key: Any = None
+
+    def accept(self, key: Any, original: Any, cleaned: Any) -> None:
+        if self.is_mapping:
+            if type(key) is not str:
+                key = str(key)
+                self.changed = True
+            self.keys.append(key)
+        if cleaned is not original:
+            self.changed = True
+        self.values.append(cleaned)
+
+    def finish(self) -> Any:
+        if not self.changed:
+            return self.source
+        if self.is_mapping:
+            return dict(zip(self.keys, self.values))
+        return self.values
+
+
 def sanitize_metadata(
     metadata: Mapping[str, Any],
     *,
@@ -17,26 +92,50 @@ def sanitize_metadata(
     max_items: int = 50,
     max_string_length: int = 2048,
 ) -> dict[str, Any]:
-    """Sanitize metadata by enforcing type safety, depth, and size limits."""
+    """Sanitize metadata by enforcing type safety, depth, and size limits.
 
-    def _clean(value: Any, depth: int) -> Any:
+    Walks the payload iteratively and returns the input object itself when nothing
+    needed changing; containers are only copied on the path to a modification.
+    """
+    if not isinstance(metadata, Mapping):
+        metadata = dict(metadata)
+
+    def _open(value: Any, kind: int, depth: int) -> _Frame:
         if depth > max_depth:
             raise MetadataValidationError("metadata exceeds maximum nesting depth")
-        if isinstance(value, Mapping):
-            if len(value) > max_items:
+        if len(value) > max_items:
+            if kind == _MAPPING:
                 raise MetadataValidationError("metadata object has too many keys")
-            return {str(k): _clean(v, depth + 1) for k, v in value.items()}
-        if isinstance(value, Sequence) and not isinstance(value, (str, bytes, bytearray)):
-            if len(value) > max_items:
-                raise MetadataValidationError("metadata array has too many items")
-            return [_clean(item, depth + 1) for item in value]
-        if isinstance(value, (str, int, float, bool)) or value is None:
-            if isinstance(value, str) and len(value) > max_string_length:
-                return value[:max_string_length]
-            return value
-        raise MetadataValidationError(f"unsupported metadata type: {type(value).__name__}")
-
-    cleaned = _clean(dict(metadata), depth=1)
+            raise MetadataValidationError("metadata array has too many items")
+        return _Frame(value, depth, kind == _MAPPING)
+
+    stack = [_open(metadata, _MAPPING, 1)]
+    while True:
+        frame = stack[-1]
+        child = next(frame.children, None)
+        if child is None:
+            stack.pop()
+            cleaned = frame.finish()
+            if not stack:
+                break
+            parent = stack[-1]
+            parent.accept(parent.pending_key, frame.source, cleaned)
+            continue
+
+        key, value = child
+        depth = frame.depth + 1
+        kind = _kind(value)
+        if kind == _MAPPING or kind == _SEQUENCE:
+            frame.pending_key = key
+            stack.append(_open(value, kind, depth))
+            continue
+        if depth > max_depth:
+            raise MetadataValidationError("metadata exceeds maximum nesting depth")
+        cleaned = value
+        if kind == _STRING and len(value) > max_string_length:
+            cleaned = value[:max_string_length]
+        frame.accept(key, value, cleaned)
+
     if not isinstance(cleaned, dict):
         raise MetadataValidationError("metadata must be an object")
     return cleaned
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import os
 from collections.abc import AsyncIterator, Callable
 from contextlib import asynccontextmanager
@@ -13,29 +12,38 @@ os.environ.setdefault("AIML_USE_PGVECTOR_STUB", "1")
 pytest_plugins = ("pytest_asyncio",)
 
 import pytest
+import pytest_asyncio
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
 
 from ai_memory_layer import config as settings_module
 from ai_memory_layer.rate_limit import reset_rate_limiter_cache
 from ai_memory_layer.database import Base, get_session
 from ai_memory_layer.main import create_app
+from ai_memory_layer.services.embedding import build_embedding_service
 from ai_memory_layer.services.message_service import MessageService
+from ai_memory_layer.services.vector_index import get_vector_index
 
 
-@pytest.fixture(scope="session")
-def event_loop() -> asyncio.AbstractEventLoop:
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def test_engine() -> AsyncIterator[AsyncEngine]:
+    """Shared in-memory SQLite engine; the schema is created once per test run."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///file:memory_layer_tests?mode=memory&cache=shared&uri=true",
+        echo=False,
+    )
 
+    # pysqlite's implicit transactions break SAVEPOINT; let SQLAlchemy emit BEGIN itself.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_implicit_begin(dbapi_connection, _record) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(connection) -> None:
+        connection.exec_driver_sql("BEGIN")
 
-@pytest.fixture
-async def test_engine() -> AsyncIterator[AsyncEngine]:
-    """In-memory SQLite engine for testing."""
-    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield engine
@@ -44,10 +52,19 @@ async def test_engine() -> AsyncIterator[AsyncEngine]:
 
 @pytest.fixture
 async def test_session(test_engine: AsyncEngine) -> AsyncIterator[AsyncSession]:
-    """Test database session."""
-    async_session = sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
-    async with async_session() as session:
-        yield session
+    """Session inside a per-test transaction; commits become savepoints and all is rolled back."""
+    async with test_engine.connect() as conn:
+        await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await conn.rollback()
 
 
 @pytest.fixture
@@ -97,11 +114,15 @@ def settings_override() -> Callable[..., Any]:
 
     def _override(**overrides: Any):
         reset_rate_limiter_cache()
+        build_embedding_service.cache_clear()
+        get_vector_index.cache_clear()
         return settings_module.override_settings(**overrides)
 
     yield _override
     settings_module.reset_overrides()
     reset_rate_limiter_cache()
+    build_embedding_service.cache_clear()
+    get_vector_index.cache_clear()
 
 
 @pytest.fixture(autouse=True)
@@ -1,5 +1,6 @@
 import pytest
-from httpx import AsyncClient
+
+from ai_memory_layer.config import get_settings
 
 
 @pytest.mark.asyncio
@@ -7,8 +8,6 @@ async def test_api_key_required_when_configured(
     client_builder, settings_override
 ):
     settings_override(api_keys=["test-key"])
-    from ai_memory_layer.config import get_settings
-
     assert "test-key" in get_settings().api_keys
 
     async with client_builder() as client:
@@ -34,3 +33,13 @@ async def test_api_key_required_when_configured(
             },
         )
         assert response.status_code == 200
+
+
+def test_api_key_set_follows_in_place_changes(settings_override):
+    settings = settings_override(api_keys=["first", "second"])
+    assert settings.api_key_set == {"first", "second"}
+
+    settings.api_keys.append("third")
+    assert "third" in settings.api_key_set
+    settings.api_keys = ["rotated"]
+    assert settings.api_key_set == {"rotated"}
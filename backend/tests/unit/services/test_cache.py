@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from ai_memory_layer.services.cache import (
+    CacheService,
+    InMemoryCache,
+    decode_embedding,
+    encode_embedding,
+)
+
+
+@pytest.mark.asyncio
+async def test_embeddings_round_trip_as_packed_float32():
+    cache = CacheService(backend=InMemoryCache(), enabled=True)
+    embedding = [0.25, -1.5, 3.0]
+    await cache.set_embedding("embedding:x", embedding, ttl=60)
+    assert isinstance(await cache.get("embedding:x"), str)
+    assert await cache.get_embedding("embedding:x") == embedding
+    assert decode_embedding(encode_embedding([0.1])) == pytest.approx([0.1])
+
+    await cache.set("embedding:legacy", embedding, ttl=60)
+    assert await cache.get_embedding("embedding:legacy") == embedding
+
+
+def test_redis_payload_codec_reads_json_and_tagged_entries():
+    from ai_memory_layer.services import cache as cache_module
+
+    payload = {"total": 1, "items": [{"score": 0.5}]}
+    assert cache_module._loads(cache_module._dumps(payload)) == payload
+    assert cache_module._loads(b'{"legacy": true}') == {"legacy": True}
+    assert cache_module._loads(None) is None
+
+
+def test_msgpack_payloads_round_trip():
+    msgpack = pytest.importorskip("msgpack")
+    from ai_memory_layer.services import cache as cache_module
+
+    payload = {"total": 2, "items": [{"id": "a", "score": 0.5}, {"id": "b", "score": None}]}
+    raw = cache_module._dumps(payload)
+    assert raw.startswith(cache_module._MSGPACK_TAG)
+    assert msgpack.unpackb(raw[3:], raw=False) == payload
+    assert cache_module._loads(raw) == payload
+
+
+class CountingBackend(InMemoryCache):
+    def __init__(self):
+        super().__init__()
+        self.deletes: list[list[str]] = []
+
+    async def delete_prefixes(self, prefixes):
+        self.deletes.append(list(prefixes))
+        await super().delete_prefixes(prefixes)
+
+
+@pytest.mark.asyncio
+async def test_scheduled_invalidations_are_coalesced(settings_override):
+    settings_override(cache_invalidate_coalesce_ms=10)
+    backend = CountingBackend()
+    cache = CacheService(backend=backend, enabled=True)
+    await cache.set("search:t:c:abc", {"total": 0}, ttl=60)
+    await cache.set("search:t:other:abc", {"total": 0}, ttl=60)
+
+    for _ in range(20):
+        await cache.schedule_invalidate("t", "c")
+    await cache.schedule_invalidate("t", "d")
+    await asyncio.sleep(0.05)
+
+    assert backend.deletes == [["search:t:c:", "search:t:d:"]]
+    assert await cache.get("search:t:c:abc") is None
+    assert await cache.get("search:t:other:abc") == {"total": 0}
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from ai_memory_layer.services.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+)
+
+
+async def _hang() -> None:
+    await asyncio.sleep(1)
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_times_out_and_opens():
+    breaker = CircuitBreaker(failure_threshold=2, request_timeout_seconds=0.01)
+    for _ in range(2):
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(_hang)
+    assert breaker.failure_count == 2
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError, match="circuit_open"):
+        await breaker.call(_hang)
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_half_opens_after_recovery():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time_seconds=0, half_open_successes=1)
+    breaker._open()
+
+    async def _ok() -> str:
+        return "ok"
+
+    assert await breaker.call(_ok) == "ok"
+    assert breaker.state is CircuitState.CLOSED
@@ -1,6 +1,15 @@
+import asyncio
+
 import pytest
 
-from ai_memory_layer.services.embedding import MockEmbeddingService, build_embedding_service
+from ai_memory_layer.services.embedding import (
+    CircuitBreakerEmbeddingService,
+    EmbeddingBatcher,
+    MockEmbeddingService,
+    _attempt_timeout,
+    _build_resizer,
+    build_embedding_service,
+)
 
 
 @pytest.mark.asyncio
@@ -11,7 +20,109 @@ async def test_mock_embedding_is_deterministic():
     assert vec1 == vec2
 
 
+@pytest.mark.asyncio
+async def test_mock_embedding_tiles_digest_to_dimensions():
+    service = MockEmbeddingService(dimensions=40)
+    vec = await service.embed("hello world")
+    assert len(vec) == 40
+    assert vec[32:] == vec[:8]
+
+
+@pytest.mark.asyncio
+async def test_mock_embed_many_matches_embed():
+    service = MockEmbeddingService(dimensions=70)
+    texts = ["alpha", "beta", "gamma"]
+    assert await service.embed_many(texts) == [await service.embed(text) for text in texts]
+
+
 def test_build_embedding_service_defaults_to_mock(settings_override):
     settings_override(embedding_provider="mock")
     service = build_embedding_service()
     assert isinstance(service, MockEmbeddingService)
+
+
+def test_build_embedding_service_is_shared(settings_override):
+    settings_override(embedding_provider="mock")
+    assert build_embedding_service() is build_embedding_service()
+
+
+def test_build_resizer_specializes_on_native_dimension():
+    assert _build_resizer(4, 4) is None
+    assert _build_resizer(4, 2)([1.0, 2.0, 3.0, 4.0]) == [1.0, 2.0]
+    assert _build_resizer(2, 4)([1.0, 2.0]) == [1.0, 2.0, 0.0, 0.0]
+    assert _build_resizer(None, 3)([1.0]) == [1.0, 0.0, 0.0]
+
+
+class RecordingEmbedder(MockEmbeddingService):
+    def __init__(self):
+        super().__init__(dimensions=4)
+        self.batches: list[list[str]] = []
+
+    async def embed_many(self, texts):
+        self.batches.append(list(texts))
+        return await super().embed_many(texts)
+
+
+@pytest.mark.asyncio
+async def test_embedding_batcher_coalesces_concurrent_calls():
+    embedder = RecordingEmbedder()
+    batcher = EmbeddingBatcher(embedder, batch_size=3, max_wait_ms=0)
+    texts = ["a", "bbb", "cc", "dddd"]
+    vectors = await asyncio.gather(*(batcher.embed(text) for text in texts))
+    assert vectors == [await embedder.embed(text) for text in texts]
+    assert embedder.batches == [["bbb", "cc", "a"], ["dddd"]]
+
+
+class ShortEmbedder(MockEmbeddingService):
+    async def embed_many(self, texts):
+        return (await super().embed_many(texts))[:-1]
+
+
+@pytest.mark.asyncio
+async def test_embedding_batcher_fails_every_caller_on_short_result():
+    batcher = EmbeddingBatcher(ShortEmbedder(dimensions=4), batch_size=3, max_wait_ms=0)
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.embed(text) for text in "abc"), return_exceptions=True),
+        timeout=1,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+class HangingEmbedder(MockEmbeddingService):
+    async def embed_many(self, texts):
+        await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_embedding_batcher_releases_callers_when_batch_is_cancelled():
+    batcher = EmbeddingBatcher(HangingEmbedder(dimensions=4), batch_size=2, max_wait_ms=0)
+    callers = [asyncio.ensure_future(batcher.embed(text)) for text in "ab"]
+    await asyncio.sleep(0)
+    for task in list(batcher._inflight):
+        task.cancel()
+    results = await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), timeout=1)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+class BrokenEmbedder:
+    async def embed(self, text: str) -> list[float]:
+        raise RuntimeError("provider down")
+
+
+@pytest.mark.asyncio
+async def test_without_fallback_raises_and_shares_breaker():
+    service = CircuitBreakerEmbeddingService(BrokenEmbedder(), MockEmbeddingService(dimensions=4))
+    assert len(await service.embed("hello")) == 4
+
+    strict = service.without_fallback()
+    assert strict.breaker is service.breaker
+    with pytest.raises(RuntimeError, match="provider down"):
+        await strict.embed_many(["hello", "world"])
+    assert service.breaker.failure_count == 2
+
+
+def test_attempt_timeout_scales_with_batch_size(settings_override):
+    settings_override(embedding_batch_size=2)
+    assert _attempt_timeout(None, 10) is None
+    assert _attempt_timeout(1.5, 1) == 1.5
+    assert _attempt_timeout(1.5, 5) == 4.5
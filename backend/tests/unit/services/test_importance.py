@@ -1,5 +1,8 @@
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
+import pytest
+
 from ai_memory_layer.services.importance import ImportanceScorer
 
 
@@ -16,3 +19,34 @@ def test_importance_scoring_with_explicit_override():
     now = datetime.now(timezone.utc)
     score = scorer.score(created_at=now, role="user", explicit_importance=0.9)
     assert 0.5 < score <= 1.0
+
+
+def test_score_batch_matches_scalar_scores():
+    scorer = ImportanceScorer()
+    now = datetime.now(timezone.utc)
+    rows = [
+        (now, "system", None),
+        (now - timedelta(hours=12), "user", 0.9),
+        (now - timedelta(days=3), "assistant", None),
+        (now, "tool", 0.2),
+    ]
+    batch = scorer.score_batch(
+        created_at=[row[0] for row in rows],
+        roles=[row[1] for row in rows],
+        explicit_importance=[row[2] for row in rows],
+    )
+    expected = [
+        scorer.score(created_at=created, role=role, explicit_importance=explicit)
+        for created, role, explicit in rows
+    ]
+    assert batch.tolist() == pytest.approx(expected, abs=1e-6)
+
+
+def test_score_batch_accepts_datetime64_arrays():
+    scorer = ImportanceScorer()
+    now = datetime.now(timezone.utc)
+    created = [now - timedelta(hours=6), now - timedelta(days=2)]
+    stamps = np.array([stamp.replace(tzinfo=None) for stamp in created], dtype="datetime64[us]")
+    from_array = scorer.score_batch(created_at=stamps, roles=["user", "system"])
+    from_datetimes = scorer.score_batch(created_at=created, roles=["user", "system"])
+    assert from_array.tolist() == pytest.approx(from_datetimes.tolist(), abs=1e-6)
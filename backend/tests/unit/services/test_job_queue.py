@@ -0,0 +1,207 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from ai_memory_layer.services.ingest_pipeline import IngestPipeline
+from ai_memory_layer.services.job_queue import EmbeddingJobQueue
+
+
+class DummySession:
+    async def commit(self) -> None:
+        return None
+
+
+class DummyRepository:
+    def __init__(self, messages):
+        self.messages = {message.id: message for message in messages}
+        self.message_rows: list = []
+        self.job_rows: list = []
+        self.job_writes = 0
+        self.released: list = []
+
+    async def get_messages(self, session, message_ids):
+        return [self.messages[mid] for mid in message_ids if mid in self.messages]
+
+    async def bulk_update_message_embeddings(self, session, rows, *, normalized=False):
+        self.message_rows.extend(rows)
+
+    async def bulk_update_embedding_jobs(self, session, rows):
+        self.job_writes += 1
+        self.job_rows.extend(rows)
+
+    async def release_embedding_jobs(self, session, job_ids):
+        self.released.extend(job_ids)
+
+
+class DummyCache:
+    async def schedule_invalidate(self, tenant_id, conversation_id=None) -> None:
+        return None
+
+
+class DummyService:
+    def __init__(self):
+        self.cache = DummyCache()
+        self.vector_index = None
+        self.active = 0
+        self.peak = 0
+
+    async def _compute_embedding(self, *, message, content, explicit_importance):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return [0.0], 0.5, "completed", None
+
+    def _base_importance_batch(self, messages):
+        return [0.5] * len(messages)
+
+    def _base_importance(self, *, message, explicit_importance):
+        return 0.5 if explicit_importance is None else explicit_importance
+
+    async def _embed_content(self, *, message, content):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return [0.0], "completed", None
+
+
+@asynccontextmanager
+async def _session_provider():
+    yield DummySession()
+
+
+def _batch(count: int):
+    messages = [
+        SimpleNamespace(
+            id=uuid4(),
+            tenant_id="tenant",
+            conversation_id="conv",
+            content=f"message {index}",
+            importance_score=None,
+        )
+        for index in range(count)
+    ]
+    jobs = [SimpleNamespace(id=uuid4(), message_id=message.id) for message in messages]
+    return messages, jobs
+
+
+class DummyJobQueue(EmbeddingJobQueue):
+    def __init__(self, messages, batches):
+        self.dummy_service = DummyService()
+        self.dummy_repository = DummyRepository(messages)
+        super().__init__(
+            service=self.dummy_service,
+            repository=self.dummy_repository,
+            session_provider=_session_provider,
+        )
+        self.batches = list(batches)
+
+    async def _claim_jobs(self):
+        return self.batches.pop(0) if self.batches else []
+
+
+@pytest.mark.asyncio
+async def test_drain_once_bounds_concurrency_and_writes_once(settings_override):
+    settings_override(embedding_job_concurrency=2)
+    messages, jobs = _batch(5)
+    jobs.append(SimpleNamespace(id=uuid4(), message_id=uuid4()))
+    queue = DummyJobQueue(messages, [jobs])
+
+    assert await queue.drain_once() == 6
+    assert queue.dummy_service.peak == 2
+    repo = queue.dummy_repository
+    assert {row[0] for row in repo.message_rows} == {message.id for message in messages}
+    assert sorted(row[1] for row in repo.job_rows) == ["completed"] * 5 + ["failed"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_processes_fed_jobs_and_fails_missing(settings_override):
+    settings_override(embedding_job_concurrency=2)
+    messages, jobs = _batch(5)
+    jobs.append(SimpleNamespace(id=uuid4(), message_id=uuid4()))
+    queue = DummyJobQueue(messages, [jobs])
+
+    await queue.pipeline.start()
+    assert await queue._feed_pipeline() == 6
+    await queue.pipeline.stop()
+
+    repo = queue.dummy_repository
+    assert {row[0] for row in repo.message_rows} == {message.id for message in messages}
+    assert {row[2] for row in repo.message_rows} == {0.5}
+    assert sorted(row[1] for row in repo.job_rows) == ["completed"] * 5 + ["failed"]
+    assert queue.dummy_service.peak > 1
+
+
+@pytest.mark.asyncio
+async def test_upsert_stage_coalesces_embed_batches():
+    messages, jobs = _batch(6)
+    repository = DummyRepository(messages)
+    pipeline = IngestPipeline(
+        service=DummyService(),
+        repository=repository,
+        session_provider=_session_provider,
+        batch_size=2,
+        embed_workers=3,
+        upsert_batch_size=64,
+        flush_interval_ms=200,
+    )
+
+    await pipeline.start()
+    for job, message in zip(jobs, messages):
+        await pipeline.submit(job.id, message)
+    await pipeline.stop()
+
+    assert len(repository.job_rows) == 6
+    assert repository.job_writes == 1
+
+
+@pytest.mark.asyncio
+async def test_score_failure_keeps_per_message_importance():
+    messages, jobs = _batch(3)
+    messages[0].importance_score = 0.9
+    repository = DummyRepository(messages)
+    service = DummyService()
+
+    def broken_batch(batch):
+        raise RuntimeError("scorer down")
+
+    service._base_importance_batch = broken_batch
+    pipeline = IngestPipeline(
+        service=service, repository=repository, session_provider=_session_provider
+    )
+
+    await pipeline.start()
+    for job, message in zip(jobs, messages):
+        await pipeline.submit(job.id, message)
+    await pipeline.stop()
+
+    scores = {row[0]: row[2] for row in repository.message_rows}
+    assert scores == {messages[0].id: 0.9, messages[1].id: 0.5, messages[2].id: 0.5}
+    assert [row[1] for row in repository.job_rows] == ["completed"] * 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_feed_releases_unsubmitted_jobs(settings_override):
+    messages, jobs = _batch(3)
+    queue = DummyJobQueue(messages, [jobs])
+    submitted = []
+    blocked = asyncio.Event()
+
+    async def slow_submit(job_id, message):
+        submitted.append(job_id)
+        if len(submitted) == 2:
+            blocked.set()
+            await asyncio.Event().wait()
+
+    queue.pipeline.submit = slow_submit
+    feeder = asyncio.create_task(queue._feed_pipeline())
+    await blocked.wait()
+    feeder.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await feeder
+
+    assert queue.dummy_repository.released == [jobs[1].id, jobs[2].id]
@@ -1,6 +1,12 @@
+from contextlib import asynccontextmanager
+
 import pytest
 
+from ai_memory_layer.schemas.memory import MemorySearchParams
 from ai_memory_layer.schemas.messages import MessageCreate
+from ai_memory_layer.services.cache import CacheService, InMemoryCache
+from ai_memory_layer.services.embedding import CircuitBreakerEmbeddingService
+from ai_memory_layer.services.job_queue import EmbeddingJobQueue
 from ai_memory_layer.services.message_service import MessageService
 
 
@@ -17,3 +23,293 @@ async def test_ingest_completes_embedding(test_session, settings_override):
     response = await service.ingest(test_session, payload)
     assert response.embedding_status == "completed"
     assert response.importance_score is not None
+
+
+@pytest.mark.asyncio
+async def test_ingest_many_writes_batch_in_order(test_session, settings_override):
+    settings_override(async_embeddings=False, cache_enabled=True)
+    service = MessageService()
+    payloads = [
+        MessageCreate(
+            tenant_id="tenant-x",
+            conversation_id="conv-1",
+            role="user",
+            content=f"batched {index}",
+            importance_override=0.9 if index == 1 else None,
+        )
+        for index in range(3)
+    ]
+    responses = await service.ingest_many(test_session, payloads)
+    assert [item.content for item in responses] == ["batched 0", "batched 1", "batched 2"]
+    assert {item.embedding_status for item in responses} == {"completed"}
+    assert responses[1].importance_score == pytest.approx(0.9)
+
+    single = await service.ingest(test_session, payloads[0])
+    stored = {
+        message.id: message
+        for message in await service.repository.get_messages(
+            test_session, [responses[0].id, single.id]
+        )
+    }
+    assert list(stored[responses[0].id].embedding) == pytest.approx(
+        list(stored[single.id].embedding)
+    )
+
+
+@pytest.mark.asyncio
+async def test_ingest_many_queues_jobs_in_async_mode(test_session, settings_override):
+    settings_override(async_embeddings=True)
+    service = MessageService(embedder=ExplodingEmbedder())
+    payloads = [
+        MessageCreate(tenant_id="tenant-q", conversation_id="c", role="user", content=text)
+        for text in ("first", "second")
+    ]
+    responses = await service.ingest_many(test_session, payloads)
+    assert [item.embedding_status for item in responses] == ["pending", "pending"]
+    claimed = await service.repository.claim_embedding_jobs(
+        test_session, limit=10, max_attempts=3, retry_backoff_seconds=0
+    )
+    assert len(claimed) == 2
+
+
+@pytest.mark.asyncio
+async def test_ingest_many_publishes_only_after_commit(
+    test_session, settings_override, monkeypatch
+):
+    settings_override(async_embeddings=False, cache_enabled=True)
+    service = MessageService()
+    invalidated = []
+
+    async def record_invalidate(tenant_id, conversation_id=None):
+        invalidated.append((tenant_id, conversation_id))
+
+    async def failing_commit():
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(service.cache, "schedule_invalidate", record_invalidate)
+    monkeypatch.setattr(test_session, "commit", failing_commit)
+    payload = MessageCreate(
+        tenant_id="tenant-c", conversation_id="conv-1", role="user", content="never lands"
+    )
+    with pytest.raises(RuntimeError):
+        await service.ingest_many(test_session, [payload])
+    assert invalidated == []
+
+    monkeypatch.undo()
+    monkeypatch.setattr(service.cache, "schedule_invalidate", record_invalidate)
+    await service.ingest_many(test_session, [payload])
+    assert invalidated == [("tenant-c", "conv-1")]
+
+
+@pytest.mark.asyncio
+async def test_search_right_after_ingest_sees_new_message(test_session, settings_override):
+    settings_override(
+        async_embeddings=False, cache_enabled=True, cache_invalidate_coalesce_ms=60_000
+    )
+    service = MessageService(cache=CacheService(backend=InMemoryCache(), enabled=True))
+    params = MemorySearchParams(tenant_id="tenant-ryw", conversation_id="c", query="hello")
+
+    def payload(content):
+        return MessageCreate(
+            tenant_id="tenant-ryw", conversation_id="c", role="user", content=content
+        )
+
+    await service.ingest(test_session, payload("hello there"))
+    assert (await service.retrieve(test_session, params)).total == 1
+
+    await service.ingest(test_session, payload("hello again"))
+    assert (await service.retrieve(test_session, params)).total == 2
+
+
+class FlakyEmbedder:
+    def __init__(self):
+        self.down = True
+
+    async def embed(self, text: str) -> list[float]:
+        if self.down:
+            raise RuntimeError("provider down")
+        return [1.0, 0.0, 0.0, 0.0]
+
+
+@pytest.mark.asyncio
+async def test_inline_embedding_failure_is_retried_by_job_queue(
+    test_session, settings_override
+):
+    settings_override(async_embeddings=False, cache_enabled=False, embedding_dimensions=4)
+    provider = FlakyEmbedder()
+    service = MessageService(embedder=CircuitBreakerEmbeddingService(provider))
+    payloads = [
+        MessageCreate(tenant_id="tenant-o", conversation_id="c", role="user", content=text)
+        for text in ("lost", "also lost")
+    ]
+    responses = await service.ingest_many(test_session, payloads)
+    assert [item.embedding_status for item in responses] == ["pending", "pending"]
+
+    @asynccontextmanager
+    async def provide_session():
+        yield test_session
+
+    provider.down = False
+    queue = EmbeddingJobQueue(service=service, session_provider=provide_session)
+    assert await queue.drain_once() == 2
+    stored = await service.repository.get_messages(test_session, [item.id for item in responses])
+    assert {message.embedding_status for message in stored} == {"completed"}
+
+    result = await service.retrieve(
+        test_session, MemorySearchParams(tenant_id="tenant-o", query="lost", top_k=5)
+    )
+    assert result.total == 2
+
+
+class ExplodingEmbedder:
+    async def embed(self, text: str) -> list[float]:
+        raise AssertionError("embedder should not be called")
+
+
+@pytest.mark.asyncio
+async def test_retrieve_uses_precomputed_query_embedding(test_session, settings_override):
+    settings_override(embedding_dimensions=4, cache_enabled=False)
+    service = MessageService(embedder=ExplodingEmbedder())
+    params = MemorySearchParams(
+        tenant_id="tenant-x",
+        query="anything",
+        query_embedding=[0.1, 0.2, 0.3, 0.4],
+    )
+    response = await service.retrieve(test_session, params)
+    assert response.total == 0
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.calls = 0
+
+    async def embed(self, text: str) -> list[float]:
+        self.calls += 1
+        return [1.0, 0.0, 0.0, 0.0]
+
+
+@pytest.mark.asyncio
+async def test_query_embeddings_are_cached(settings_override):
+    settings_override(cache_enabled=True, query_embedding_lru_size=1)
+    embedder = CountingEmbedder()
+    service = MessageService(embedder=embedder)
+
+    assert await service._embed_query("what did I say?") == [1.0, 0.0, 0.0, 0.0]
+    await service._embed_query("what did I say?")
+    assert embedder.calls == 1
+
+    # Evicted from the local LRU, but still served by the shared cache.
+    await service._embed_query("something else")
+    await service._embed_query("what did I say?")
+    assert embedder.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_query_lru_works_without_shared_cache(settings_override):
+    settings_override(cache_enabled=False, query_embedding_lru_size=4)
+    embedder = CountingEmbedder()
+    service = MessageService(embedder=embedder)
+    assert not service.cache.enabled
+
+    await service._embed_query("what did I say?")
+    await service._embed_query("what did I say?")
+    assert embedder.calls == 1
+
+    settings_override(cache_enabled=False, query_embedding_lru_size=0)
+    disabled = MessageService(embedder=embedder)
+    await disabled._embed_query("what did I say?")
+    await disabled._embed_query("what did I say?")
+    assert embedder.calls == 3
+    assert not disabled._query_lru
+
+
+class RecordingCache(InMemoryCache):
+    def __init__(self):
+        super().__init__()
+        self.calls: list[str] = []
+
+    async def get(self, key):
+        self.calls.append("get")
+        return await super().get(key)
+
+    async def get_many(self, keys):
+        self.calls.append("get_many")
+        return await super().get_many(keys)
+
+    async def set_many(self, entries):
+        self.calls.append("set_many")
+        await super().set_many(entries)
+
+
+@pytest.mark.asyncio
+async def test_retrieve_batches_cache_round_trips(test_session, settings_override):
+    settings_override(cache_enabled=True)
+    backend = RecordingCache()
+    service = MessageService(cache=CacheService(backend=backend, enabled=True))
+    params = MemorySearchParams(tenant_id="tenant-x", query="anything")
+
+    await service.retrieve(test_session, params)
+    assert backend.calls == ["get_many", "set_many"]
+    assert len(backend._store) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_search_response_matches_fresh_one(test_session, settings_override):
+    settings_override(async_embeddings=False, cache_enabled=True)
+    service = MessageService(cache=CacheService(backend=InMemoryCache(), enabled=True))
+    await service.ingest(
+        test_session,
+        MessageCreate(tenant_id="tenant-x", conversation_id="conv-1", role="user", content="hi"),
+    )
+    params = MemorySearchParams(tenant_id="tenant-x", query="hi")
+
+    fresh = await service.retrieve(test_session, params)
+    cached = await service.retrieve(test_session, params)
+    assert fresh.total == 1
+    assert cached.model_dump() == fresh.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_repeated_search_does_not_reembed_query(test_session, settings_override):
+    settings_override(cache_enabled=True, embedding_dimensions=4)
+    embedder = CountingEmbedder()
+    service = MessageService(
+        embedder=embedder, cache=CacheService(backend=InMemoryCache(), enabled=True)
+    )
+    params = MemorySearchParams(tenant_id="tenant-x", query="repeat me")
+
+    await service.retrieve(test_session, params)
+    await service.retrieve(test_session, params)
+    assert embedder.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_vector_index_picks_up_embeddings_written_elsewhere(test_session, settings_override):
+    pytest.importorskip("faiss")
+    from ai_memory_layer.services.embedding import MockEmbeddingService
+    from ai_memory_layer.services.vector_index import VectorIndex
+
+    settings_override(async_embeddings=False, cache_enabled=False, embedding_dimensions=8)
+    service = MessageService(vector_index=VectorIndex(dimensions=8))
+    params = MemorySearchParams(tenant_id="tenant-ix", query="hello", top_k=5)
+    first = await service.ingest(
+        test_session,
+        MessageCreate(tenant_id="tenant-ix", conversation_id="c", role="user", content="hello"),
+    )
+    assert [item.message_id for item in (await service.retrieve(test_session, params)).items] == [
+        first.id
+    ]
+
+    # Another process (the worker) embeds a queued row; this service's index is never told.
+    (queued,) = await service.repository.create_messages(
+        test_session,
+        [{"tenant_id": "tenant-ix", "conversation_id": "c", "role": "user", "content": "queued"}],
+    )
+    embedding = await MockEmbeddingService(dimensions=8).embed("queued")
+    await service.repository.bulk_update_message_embeddings(
+        test_session, [(queued.id, embedding, 0.5, "completed")]
+    )
+    await test_session.commit()
+
+    found = {item.message_id for item in (await service.retrieve(test_session, params)).items}
+    assert found == {first.id, queued.id}
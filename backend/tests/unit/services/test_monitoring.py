@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+
+from ai_memory_layer import main
+from ai_memory_layer.services import monitoring
+from ai_memory_layer.services.monitoring import MonitoringService
+
+
+@pytest.mark.asyncio
+async def test_hung_probe_times_out_without_blocking_others(settings_override, monkeypatch):
+    settings_override(redis_url=None, healthcheck_timeout_seconds=0.05)
+    service = MonitoringService()
+    alerts = []
+    service.register_alert_handler(alerts.append)
+
+    async def hung_db():
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(service, "_check_db", hung_db)
+    health = await service.check_health()
+
+    assert health["status"] == "unhealthy"
+    assert health["checks"]["database"]["error"] == "timeout"
+    assert health["checks"]["metrics"]["healthy"] is True
+    assert "error_rate" in health["checks"]["metrics"]
+    assert [alert["type"] for alert in alerts] == ["database_unhealthy"]
+
+
+@pytest.mark.asyncio
+async def test_probes_run_concurrently(settings_override, monkeypatch):
+    settings_override(redis_url=None)
+    service = MonitoringService()
+
+    async def slow_db():
+        await asyncio.sleep(0.1)
+        return {"healthy": True, "latency_ms": 1.0}
+
+    async def slow_metrics():
+        await asyncio.sleep(0.1)
+        return {"healthy": True}
+
+    monkeypatch.setattr(service, "_check_db", slow_db)
+    monkeypatch.setattr(service, "_check_metrics", slow_metrics)
+    start = time.perf_counter()
+    health = await service.check_health()
+
+    assert time.perf_counter() - start < 0.19
+    assert health["status"] == "healthy"
+
+
+class FakeRedis:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class IdleJobQueue:
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_lifespan_shutdown_closes_monitoring_pool(settings_override, monkeypatch):
+    settings_override(redis_url=None)
+
+    async def noop():
+        return None
+
+    monkeypatch.setattr(main, "init_engine", noop)
+    monkeypatch.setattr(main, "check_migrations", noop)
+    monkeypatch.setattr(main, "EmbeddingJobQueue", IdleJobQueue)
+    service = monitoring.get_monitoring_service()
+    redis = service._redis = FakeRedis()
+
+    async with main.lifespan(main.app):
+        assert not redis.closed
+    assert redis.closed
+    assert monitoring._monitoring_service is None
@@ -1,6 +1,11 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
 import pytest
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ai_memory_layer.models.memory import ArchivedMessage, Message
 from ai_memory_layer.repositories.memory_repository import MemoryRepository
 from ai_memory_layer.services.retention import RetentionService
 
@@ -17,3 +22,150 @@ async def test_retention_service_respects_actions(test_session: AsyncSession):
     )
     assert result.archived == 0
     assert result.deleted == 0
+
+
+@pytest.mark.asyncio
+async def test_retention_archives_matching_messages_in_bulk(test_session: AsyncSession):
+    repo = MemoryRepository()
+    await repo.create_messages(
+        test_session,
+        [
+            {
+                "tenant_id": "bulk-tenant",
+                "conversation_id": "conv",
+                "role": "user",
+                "content": f"message {index}",
+                "message_metadata": {"index": index},
+                "importance_score": importance,
+            }
+            for index, importance in enumerate([0.1, 0.2, 0.9])
+        ],
+    )
+
+    result = await RetentionService(repository=repo).run(
+        test_session, tenant_id="bulk-tenant", actions={"archive"}
+    )
+    assert result.archived == 2
+
+    archived = (
+        await test_session.execute(
+            select(ArchivedMessage).where(ArchivedMessage.tenant_id == "bulk-tenant")
+        )
+    ).scalars().all()
+    assert sorted(row.message_metadata["index"] for row in archived) == [0, 1]
+    assert {row.archive_reason for row in archived} == {"policy"}
+    remaining = (
+        await test_session.execute(
+            select(Message.importance_score).where(
+                Message.tenant_id == "bulk-tenant", Message.archived.is_(False)
+            )
+        )
+    ).scalars().all()
+    assert remaining == [0.9]
+
+
+@pytest.mark.asyncio
+async def test_retention_dry_run_counts_without_writing(test_session: AsyncSession):
+    repo = MemoryRepository()
+    await repo.create_messages(
+        test_session,
+        [
+            {
+                "tenant_id": "dry-tenant",
+                "conversation_id": "conv",
+                "role": "user",
+                "content": "preview",
+                "importance_score": importance,
+            }
+            for importance in (0.1, 0.9)
+        ],
+    )
+
+    result = await RetentionService(repository=repo).run(
+        test_session, tenant_id="dry-tenant", dry_run=True
+    )
+    assert (result.archived, result.deleted) == (1, 0)
+    assert await repo.load_policy(test_session, "dry-tenant") is None
+    flagged = (
+        await test_session.execute(
+            select(Message).where(Message.tenant_id == "dry-tenant", Message.archived.is_(True))
+        )
+    ).scalars().all()
+    assert flagged == []
+
+
+@pytest.mark.asyncio
+async def test_retention_dry_run_counts_match_real_run(test_session: AsyncSession):
+    repo = MemoryRepository()
+    now = datetime.now(timezone.utc)
+    await repo.create_messages(
+        test_session,
+        [
+            {
+                "tenant_id": "parity",
+                "conversation_id": "conv",
+                "role": "user",
+                "content": f"message {index}",
+                "importance_score": importance,
+                "created_at": now - timedelta(days=age),
+            }
+            for index, (importance, age) in enumerate([(0.1, 1), (0.2, 5), (0.9, 40), (0.9, 1)])
+        ],
+    )
+    test_session.add_all(
+        ArchivedMessage(
+            id=uuid4(),
+            tenant_id="parity",
+            conversation_id="conv",
+            role="user",
+            content="old",
+            archive_reason="policy",
+            archived_at=now - timedelta(days=age),
+        )
+        for age in (120, 10)
+    )
+    await test_session.flush()
+
+    service = RetentionService(repository=repo)
+    preview = await service.run(test_session, tenant_id="parity", dry_run=True)
+    applied = await service.run(test_session, tenant_id="parity")
+    assert (preview.archived, preview.deleted) == (applied.archived, applied.deleted) == (3, 1)
+
+
+@pytest.mark.asyncio
+async def test_archive_only_flags_rows_it_copied(test_session: AsyncSession, monkeypatch):
+    from sqlalchemy import Insert, update
+
+    repo = MemoryRepository()
+    early, late = await repo.create_messages(
+        test_session,
+        [
+            {"tenant_id": "race", "conversation_id": "c", "role": "user", "content": text,
+             "importance_score": score}
+            for text, score in (("early", 0.1), ("late", 0.9))
+        ],
+    )
+    execute = test_session.execute
+
+    async def _execute(statement, *args, **kwargs):
+        result = await execute(statement, *args, **kwargs)
+        if isinstance(statement, Insert) and statement.table.name == "archived_messages":
+            # A concurrent writer makes "late" match right after the copy.
+            await execute(
+                update(Message).where(Message.id == late.id).values(importance_score=0.0)
+            )
+        return result
+
+    monkeypatch.setattr(test_session, "execute", _execute)
+    archived = await repo.archive_matching(
+        test_session,
+        tenant_id="race",
+        older_than_days=30,
+        importance_threshold=0.35,
+        reason="policy",
+    )
+    assert archived == 1
+    flagged = (
+        await execute(select(Message.id).where(Message.tenant_id == "race", Message.archived))
+    ).scalars().all()
+    assert flagged == [early.id]
@@ -1,17 +1,39 @@
+import math
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta, timezone
-from types import SimpleNamespace
+from typing import Any
 
-from ai_memory_layer.services.retrieval import MemoryRetriever
+import numpy as np
+import pytest
 
+from ai_memory_layer.services.retrieval import (
+    MemoryRetriever,
+    cosine_similarity,
+    normalize_embedding,
+)
 
-def _message(content: str, importance: float, created_at: datetime) -> SimpleNamespace:
-    return SimpleNamespace(
+
+@dataclass(slots=True, frozen=True)
+class MessageView:
+    """Slotted stand-in for a loaded ``Message`` row, float32 embedding included."""
+
+    id: str
+    content: str
+    role: str
+    importance_score: float
+    embedding: np.ndarray
+    created_at: datetime
+    metadata: dict[str, Any] = field(default_factory=dict)
+    embedding_normalized: bool = False
+
+
+def _message(content: str, importance: float, created_at: datetime) -> MessageView:
+    return MessageView(
         id=content,
         content=content,
         role="user",
-        metadata={},
         importance_score=importance,
-        embedding=[float(len(content)), 1.0],
+        embedding=np.asarray([len(content), 1.0], dtype=np.float32),
         created_at=created_at,
     )
 
@@ -26,3 +48,120 @@ def test_retriever_orders_by_combined_score():
     query_embedding = [10.0, 1.0]
     ranked = retriever.rank(query_embedding=query_embedding, candidates=messages, top_k=2)
     assert ranked[0].message.content == "much longer text"
+
+
+def test_retriever_similarity_matches_cosine_and_truncates():
+    retriever = MemoryRetriever()
+    now = datetime.now(timezone.utc)
+    messages = [_message("x" * size, 0.5, now) for size in range(1, 6)]
+    messages.append(replace(_message("bad", 0.5, now), embedding=np.ones(1, dtype=np.float32)))
+    query_embedding = [3.0, 1.0]
+    ranked = retriever.rank(query_embedding=query_embedding, candidates=messages, top_k=3)
+    assert len(ranked) == 3
+    assert [item.score for item in ranked] == sorted((item.score for item in ranked), reverse=True)
+    for item in ranked:
+        expected = cosine_similarity(query_embedding, item.message.embedding.tolist())
+        assert abs(item.similarity - expected) < 1e-6
+
+
+def test_retriever_trusts_prenormalized_embeddings():
+    retriever = MemoryRetriever()
+    now = datetime.now(timezone.utc)
+    # Flagged as normalized, so the non-unit vector is used as-is.
+    stored = replace(
+        _message("a", 0.5, now),
+        embedding=np.asarray([2.0, 0.0], dtype=np.float32),
+        embedding_normalized=True,
+    )
+    ranked = retriever.rank(query_embedding=[3.0, 0.0], candidates=[stored], top_k=1)
+    assert abs(ranked[0].similarity - 2.0) < 1e-6
+    assert normalize_embedding([3.0, 4.0]) == pytest.approx([0.6, 0.8])
+
+
+def test_rank_leaves_caller_query_untouched():
+    now = datetime.now(timezone.utc)
+    query = np.array([3.0, 4.0], dtype=np.float32)
+    MemoryRetriever().rank(
+        query_embedding=query, candidates=[_message("abc", 0.5, now)], top_k=1
+    )
+    assert query.tolist() == [3.0, 4.0]
+
+
+def test_numba_kernel_matches_numpy_path(monkeypatch):
+    pytest.importorskip("numba")
+    from ai_memory_layer.services import retrieval
+
+    now = datetime.now(timezone.utc)
+    messages = [
+        _message("m" * (index % 17 + 1), (index % 10) / 10, now - timedelta(hours=index))
+        for index in range(retrieval.JIT_MIN_CANDIDATES + 10)
+    ]
+    retriever = MemoryRetriever()
+    jitted = retriever.rank(query_embedding=[5.0, 1.0], candidates=messages, top_k=5)
+    monkeypatch.setattr(retrieval, "score_candidates", None)
+    plain = retriever.rank(query_embedding=[5.0, 1.0], candidates=messages, top_k=5)
+    assert [item.score for item in jitted] == pytest.approx([item.score for item in plain])
+
+
+def test_numba_top_k_matches_stable_sort():
+    pytest.importorskip("numba")
+    from ai_memory_layer.services._retrieval_kernels import top_k_indices
+
+    scores = np.random.default_rng(7).integers(0, 20, size=500).astype(np.float64)
+    expected = np.argsort(-scores, kind="stable")[:10]
+    assert top_k_indices(scores, 10).tolist() == expected.tolist()
+
+
+def test_top_k_heap_path_matches_argpartition_path(monkeypatch):
+    pytest.importorskip("numba")
+    from ai_memory_layer.services import retrieval
+
+    scores = np.random.default_rng(11).integers(0, 50, size=retrieval.JIT_MIN_CANDIDATES * 3)
+    scores = scores.astype(np.float64)
+    assert retrieval.top_k_indices is not None
+    for top_k in (1, 10, 64, scores.size):
+        heap = retrieval._top_k(scores, top_k)
+        with monkeypatch.context() as patched:
+            patched.setattr(retrieval, "top_k_indices", None)
+            partitioned = retrieval._top_k(scores, top_k)
+        assert heap.tolist() == partitioned.tolist()
+
+
+def test_retriever_ages_naive_timestamps_as_utc():
+    retriever = MemoryRetriever()
+    created = datetime.now(timezone.utc) - timedelta(days=7)
+    aware = _message("aware", 0.5, created.astimezone(timezone(timedelta(hours=5))))
+    naive = _message("naive", 0.5, created.replace(tzinfo=None))
+    ranked = retriever.rank(query_embedding=[1.0, 1.0], candidates=[aware, naive], top_k=2)
+    assert [item.decay for item in ranked] == pytest.approx([math.exp(-1)] * 2, rel=1e-4)
+
+
+@pytest.mark.asyncio
+async def test_rank_stream_matches_rank_over_all_candidates():
+    retriever = MemoryRetriever()
+    now = datetime.now(timezone.utc)
+    messages = [
+        _message("s" * (index % 7 + 1), (index % 5) / 5, now - timedelta(hours=index))
+        for index in range(40)
+    ]
+
+    async def _chunks():
+        for start in range(0, len(messages), 16):
+            yield messages[start : start + 16]
+
+    streamed = await retriever.rank_stream(query_embedding=[4.0, 1.0], batches=_chunks(), top_k=5)
+    whole = retriever.rank(query_embedding=[4.0, 1.0], candidates=messages, top_k=5)
+    assert [item.message.id for item in streamed] == [item.message.id for item in whole]
+
+
+def test_rank_reuses_scratch_matrix_between_calls():
+    retriever = MemoryRetriever()
+    now = datetime.now(timezone.utc)
+    large = [_message("r" * (index + 1), 0.5, now) for index in range(12)]
+    small = large[:4]
+    first = retriever.rank(query_embedding=[3.0, 1.0], candidates=large, top_k=3)
+    scratch = retriever._scratch
+    retriever.rank(query_embedding=[3.0, 1.0], candidates=small, top_k=3)
+    again = retriever.rank(query_embedding=[3.0, 1.0], candidates=large, top_k=3)
+    assert retriever._scratch is scratch
+    assert [item.score for item in again] == pytest.approx([item.score for item in first])
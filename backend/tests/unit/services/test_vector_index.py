@@ -0,0 +1,48 @@
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("faiss")
+
+from ai_memory_layer.services.vector_index import VectorIndex
+
+
+def test_vector_index_searches_by_tenant_and_conversation():
+    index = VectorIndex(dimensions=2)
+    near, far, other = uuid4(), uuid4(), uuid4()
+    assert index.search("tenant", [1.0, 0.0], conversation_id=None, limit=2) is None
+
+    index.build("tenant", [(near, "a", [2.0, 0.1], None), (far, "a", [0.0, 1.0], None)])
+    index.add("tenant", other, "b", [1.0, 0.0])
+
+    assert index.search("tenant", [1.0, 0.0], conversation_id=None, limit=2) == [other, near]
+    assert index.search("tenant", [1.0, 0.0], conversation_id="a", limit=5) == [near, far]
+    index.invalidate("tenant")
+    assert not index.is_built("tenant")
+
+
+def test_hnsw_index_skips_replaced_vectors():
+    index = VectorIndex(dimensions=2, hnsw_m=8)
+    first, second = uuid4(), uuid4()
+    index.build("tenant", [(first, "a", [1.0, 0.0], None), (second, "a", [0.0, 1.0], None)])
+    index.add("tenant", first, "a", [-1.0, 0.1])
+
+    assert index.search("tenant", [1.0, 0.0], conversation_id=None, limit=2) == [second, first]
+    assert index.search("tenant", [1.0, 0.0], conversation_id="a", limit=1) == [second]
+
+
+def test_vector_index_tracks_row_versions():
+    from datetime import datetime, timedelta
+
+    index = VectorIndex(dimensions=2)
+    first, second = uuid4(), uuid4()
+    built_at = datetime(2024, 1, 1)
+    index.build("tenant", [(first, "a", [1.0, 0.0], built_at)])
+    assert index.watermark("tenant") == built_at
+
+    later = built_at + timedelta(seconds=5)
+    versions = [(first, built_at), (second, later)]
+    assert index.changed("tenant", versions) == [second]
+    index.add("tenant", second, "a", [0.0, 1.0], later)
+    assert index.changed("tenant", versions) == []
+    assert index.watermark("tenant") == later
@@ -1,5 +1,6 @@
 import asyncio
 
+from ai_memory_layer import rate_limit
 from ai_memory_layer.rate_limit import InMemoryRateLimiter, RateLimitConfig, _parse_limit
 
 
@@ -24,3 +25,19 @@ def test_parse_limit_variants():
     assert _parse_limit("200/minute") == RateLimitConfig(amount=200, window_seconds=60)
     assert _parse_limit("10 per second").window_seconds == 1
 
+
+def test_in_memory_rate_limiter_refills_tokens_over_window(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock[0])
+    limiter = InMemoryRateLimiter()
+    config = RateLimitConfig(amount=2, window_seconds=60)
+
+    async def _exercise():
+        results = [await limiter.hit(config, "client") for _ in range(3)]
+        clock[0] += 30  # half the window refills one token
+        results.append(await limiter.hit(config, "client"))
+        results.append(await limiter.hit(config, "client"))
+        return results
+
+    allowed = [result.allowed for result in asyncio.run(_exercise())]
+    assert allowed == [True, True, False, True, False]
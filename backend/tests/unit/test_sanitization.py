@@ -0,0 +1,25 @@
+import pytest
+
+from ai_memory_layer.utils.sanitization import MetadataValidationError, sanitize_metadata
+
+
+def test_sanitize_metadata_returns_valid_input_unchanged():
+    metadata = {"source": "chat", "tags": ["a", "b"], "extra": {"score": 1.5, "flag": None}}
+    assert sanitize_metadata(metadata) is metadata
+
+
+def test_sanitize_metadata_copies_only_modified_paths():
+    metadata = {"note": "x" * 10, "tags": ["a"], 7: (1, 2)}
+    cleaned = sanitize_metadata(metadata, max_string_length=4)
+    assert cleaned == {"note": "xxxx", "tags": ["a"], "7": [1, 2]}
+    assert cleaned["tags"] is metadata["tags"]
+    assert metadata["note"] == "x" * 10
+
+
+@pytest.mark.parametrize(
+    "metadata",
+    [{"a": b"raw"}, {"a": [[[[1]]]]}, {"a": list(range(51))}],
+)
+def test_sanitize_metadata_rejects_invalid_payloads(metadata):
+    with pytest.raises(MetadataValidationError):
+        sanitize_metadata(metadata)
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from ai_memory_layer.scheduler import RetentionScheduler
@@ -24,3 +26,32 @@ async def test_retention_scheduler_run_once(settings_override):
     )
     await scheduler.run_once()
     assert set(scheduler.tenants) == {"tenant-a", "tenant-b"}
+
+
+class SlowRetentionService(DummyRetentionService):
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.peak = 0
+
+    async def run(self, session, *, tenant_id: str, actions=None, dry_run: bool = False):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if tenant_id == "tenant-bad":
+            raise RuntimeError("boom")
+        self.invocations.append(tenant_id)
+        return self.invocations  # type: ignore[return-value]
+
+
+@pytest.mark.asyncio
+async def test_retention_scheduler_runs_tenants_concurrently_with_bound():
+    service = SlowRetentionService()
+    tenants = ["tenant-bad", *(f"tenant-{index}" for index in range(5))]
+    scheduler = RetentionScheduler(
+        service=service, interval_seconds=0, tenant_ids=tenants, max_parallel=2
+    )
+    await scheduler.run_once()
+    assert sorted(service.invocations) == sorted(tenants[1:])
+    assert service.peak == 2